@@ -0,0 +1,221 @@
+import os
+import queue
+import threading
+from collections import OrderedDict
+import pygame
+
+from tilemap import TileMap
+
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+IMAGE_EXT = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tga')
+SOUND_EXT = ('.wav', '.ogg')
+
+
+# kind -> (load, finalize). load runs on the loader thread and must not touch
+# the display; finalize runs on the main thread (display-format conversion).
+def _load_image(path):
+    return pygame.image.load(path)
+
+
+def _finalize_image(surf):
+    if pygame.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha()
+
+
+def _load_sound(path):
+    if not pygame.mixer.get_init():
+        return None
+    return pygame.mixer.Sound(path)
+
+
+def _load_map(map_id):
+    tm = TileMap.load(map_id)
+    tm.prerender()
+    return tm
+
+
+def _finalize_map(tm):
+    tm.convert_chunks()
+    return tm
+
+
+LOADERS = {
+    'image': (_load_image, _finalize_image),
+    'sound': (_load_sound, lambda snd: snd),
+    'map': (_load_map, _finalize_map),
+}
+
+
+def bundle(character=None, map_id=None):
+    """Asset keys a game session with this character and map needs.
+
+    The map itself, plus every image/sound under assets/characters/<id>/
+    and assets/maps/<id>/ when those folders exist.
+    """
+    keys = []
+    if map_id:
+        keys.append(('map', map_id))
+    for sub, name in (('characters', character), ('maps', map_id)):
+        folder = os.path.join(ASSETS_DIR, sub, name) if name else None
+        if not folder or not os.path.isdir(folder):
+            continue
+        for fn in sorted(os.listdir(folder)):
+            ext = os.path.splitext(fn)[1].lower()
+            if ext in IMAGE_EXT:
+                keys.append(('image', os.path.join(folder, fn)))
+            elif ext in SOUND_EXT:
+                keys.append(('sound', os.path.join(folder, fn)))
+    return keys
+
+
+class _Entry:
+    __slots__ = ('state', 'raw', 'value', 'error', 'refs', 'done')
+
+    def __init__(self):
+        self.state = 'queued'   # queued -> loaded | failed -> ready
+        self.raw = None
+        self.value = None
+        self.error = None
+        self.refs = 0
+        self.done = threading.Event()
+
+
+class AssetManager:
+    """Shared, reference-counted asset cache fed by one loader thread.
+
+    preload(keys) queues decoding in the background; poll() (called once a
+    frame by the SceneManager) finishes loaded assets on the main thread
+    within a small per-frame budget; acquire(key) returns the finished
+    asset, blocking only if it is still being decoded, and release(key)
+    drops the reference. Up to `keep` unreferenced assets stay cached so
+    re-entering a scene does not reload them.
+    """
+
+    def __init__(self, keep=8, finalize_per_poll=2):
+        self.keep = keep
+        self.finalize_per_poll = finalize_per_poll
+        self._entries = {}
+        self._idle = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._loaded = queue.Queue()
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker, name='asset-loader', daemon=True)
+            self._thread.start()
+
+    def _worker(self):
+        while True:
+            key = self._queue.get()
+            if key is None:
+                return
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None or entry.state != 'queued':
+                continue
+            try:
+                entry.raw = LOADERS[key[0]][0](key[1])
+                entry.state = 'loaded'
+            except Exception as exc:
+                entry.error = exc
+                entry.state = 'failed'
+            entry.done.set()
+            self._loaded.put(key)
+
+    def _request(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if key in self._idle:
+                    self._idle.move_to_end(key)
+                return entry
+            entry = self._entries[key] = _Entry()
+        self._ensure_thread()
+        self._queue.put(key)
+        return entry
+
+    def preload(self, keys):
+        for key in keys:
+            self._request(key)
+        return keys
+
+    def _finalize(self, key, entry):
+        # main thread only
+        if entry.state == 'loaded':
+            try:
+                entry.value = LOADERS[key[0]][1](entry.raw)
+                entry.state = 'ready'
+            except Exception as exc:
+                entry.error = exc
+                entry.state = 'failed'
+            entry.raw = None
+        if entry.state == 'ready' and entry.refs == 0:
+            self._park(key)
+
+    def poll(self):
+        for _ in range(self.finalize_per_poll):
+            try:
+                key = self._loaded.get_nowait()
+            except queue.Empty:
+                return
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            if entry.state == 'failed':
+                print(f'asset {key[0]} {key[1]!r} failed to load: {entry.error}')
+                continue
+            self._finalize(key, entry)
+
+    def progress(self, keys):
+        # fraction of keys decoded (finished or failed); 1.0 for an empty list
+        if not keys:
+            return 1.0
+        done = sum(1 for k in keys if k in self._entries and self._entries[k].state != 'queued')
+        return done / len(keys)
+
+    def ready(self, keys):
+        return all(k in self._entries and self._entries[k].state == 'ready' for k in keys)
+
+    def acquire(self, key):
+        entry = self._request(key)
+        entry.done.wait()
+        if entry.state == 'loaded':
+            self._finalize(key, entry)
+        if entry.state == 'failed':
+            # forget it so a later request retries
+            with self._lock:
+                self._entries.pop(key, None)
+            raise entry.error
+        entry.refs += 1
+        self._idle.pop(key, None)
+        return entry.value
+
+    def release(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry.refs <= 0:
+            return
+        entry.refs -= 1
+        if entry.refs == 0:
+            self._park(key)
+
+    def _park(self, key):
+        # unreferenced but cached; the oldest go once more than `keep` pile up
+        self._idle[key] = True
+        self._idle.move_to_end(key)
+        while len(self._idle) > self.keep:
+            old, _ = self._idle.popitem(last=False)
+            with self._lock:
+                self._entries.pop(old, None)
+
+    def stats(self):
+        states = {}
+        for entry in list(self._entries.values()):
+            states[entry.state] = states.get(entry.state, 0) + 1
+        return {'entries': len(self._entries), 'idle': len(self._idle), 'pending': self._queue.qsize(), 'states': states}
+
+    def close(self):
+        self._queue.put(None)
@@ -0,0 +1,135 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pygame
+
+from bots import BotController
+
+
+_scene_cls = None
+
+
+def _init_worker():
+    # each worker process owns its own headless pygame (fonts are needed by BaseScene)
+    global _scene_cls
+    pygame.init()
+    from scenes.game import GameScene
+    _scene_cls = GameScene
+
+
+def run_one(params, seed, players=1, max_time=300.0, dt=1.0 / 60):
+    """One headless GameScene run driven by bots; returns a result dict."""
+    if _scene_cls is None:
+        _init_worker()
+    random.seed(seed)
+    scene = _scene_cls(pygame.Surface((800, 600)), None)
+    scene.particles.enabled = False
+    scene.history.enabled = False
+    roster = [{'username': f'bot{i + 1}', 'character': ('mage' if i % 2 else 'warrior')} for i in range(players)]
+    scene.on_enter(new=True, players=roster, tuning=params)
+    bots = [BotController(scene, i, random.Random(seed * 1000 + i)) for i in range(players)]
+
+    sim_time = 0.0
+    ticks = 0
+    tick_total = 0.0
+    tick_max = 0.0
+    peak_entities = 0
+    wave = scene.wave
+    wave_started = 0.0
+    wave_times = []
+    outcome = 'timeout'
+    paused = 0.0
+    while sim_time < max_time:
+        for bot in bots:
+            bot.step(dt)
+        t0 = time.perf_counter()
+        scene.update(dt)
+        cost = time.perf_counter() - t0
+        tick_total += cost
+        tick_max = max(tick_max, cost)
+        ticks += 1
+        sim_time += dt
+        entities = len(scene.enemies) + len(scene.bullets) + len(scene.enemy_bullets)
+        peak_entities = max(peak_entities, entities)
+        if scene.wave != wave:
+            wave_times.append(round(sim_time - wave_started, 3))
+            wave = scene.wave
+            wave_started = sim_time
+        if scene._death_timer is not None:
+            outcome = 'died'
+            break
+        # boss-slain / post-boss pauses stop the sim briefly; much longer means stuck
+        paused = paused + dt if not scene.running else 0.0
+        if paused > 30.0:
+            outcome = 'stalled'
+            break
+
+    return {
+        'params': params,
+        'seed': seed,
+        'players': players,
+        'outcome': outcome,
+        'waves_survived': scene.wave - 1,
+        'sim_time': round(sim_time, 3),
+        'time_to_kill': wave_times,
+        'mean_time_to_kill': round(sum(wave_times) / len(wave_times), 3) if wave_times else None,
+        'peak_entities': peak_entities,
+        'ticks': ticks,
+        'tick_ms_mean': round(tick_total / max(1, ticks) * 1000.0, 4),
+        'tick_ms_max': round(tick_max * 1000.0, 4),
+    }
+
+
+def expand_grid(grid):
+    # {'a': [1, 2], 'b': [3]} -> [{'a': 1, 'b': 3}, {'a': 2, 'b': 3}]
+    keys = sorted(grid)
+    values = [grid[k] if isinstance(grid[k], list) else [grid[k]] for k in keys]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def run_batch(grid, seeds, out_path, players=1, max_time=300.0, workers=None):
+    jobs = [(params, seed) for params in expand_grid(grid) for seed in seeds]
+    workers = workers or os.cpu_count() or 1
+    done = 0
+    started = time.perf_counter()
+    with open(out_path, 'a', encoding='utf-8') as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(run_one, params, seed, players, max_time) for params, seed in jobs]
+        for fut in as_completed(futures):
+            # stream each run as soon as it finishes so partial sweeps are usable
+            out.write(json.dumps(fut.result()) + '\n')
+            out.flush()
+            done += 1
+            print(f'\r{done}/{len(jobs)} runs  {time.perf_counter() - started:.1f}s', end='', flush=True)
+    print()
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Headless balance sweeps over GameScene.DEFAULT_TUNING')
+    parser.add_argument('--grid', default='{}', help='JSON object of tuning key -> list of values (or a path to a JSON file)')
+    parser.add_argument('--seeds', type=int, default=4, help='seeds per grid point')
+    parser.add_argument('--players', type=int, default=1, help='bot players per run')
+    parser.add_argument('--max-time', type=float, default=300.0, help='simulated seconds per run')
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: all cores)')
+    parser.add_argument('--out', default='balance_results.jsonl')
+    args = parser.parse_args(argv)
+    grid = json.load(open(args.grid, encoding='utf-8')) if os.path.exists(args.grid) else json.loads(args.grid)
+    from scenes.game import GameScene
+    unknown = sorted(set(grid) - set(GameScene.DEFAULT_TUNING))
+    if unknown:
+        parser.error(f'unknown tuning keys: {", ".join(unknown)}')
+    run_batch(grid, range(args.seeds), args.out, args.players, args.max_time, args.workers)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
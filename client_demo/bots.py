@@ -0,0 +1,85 @@
+import math
+import random
+
+
+class BotController:
+    """Drives one GameScene player slot with a simple scripted policy.
+
+    The bot only touches the same inputs a human does (the player's _move
+    flags, _fire_bullet and _activate_ult), so every per-player code path in
+    GameScene.update runs exactly as it would for a real player.
+    """
+
+    def __init__(self, scene, idx, rng=None, flee_radius=140.0, dodge_radius=70.0):
+        self.scene = scene
+        self.idx = idx
+        self.rng = rng or random.Random()
+        self.flee_radius = flee_radius
+        self.dodge_radius = dodge_radius
+        self._wander = (0.0, 0.0)
+        self._wander_timer = 0.0
+
+    def step(self, dt):
+        scene = self.scene
+        if self.idx >= len(scene.players):
+            return
+        p = scene.players[self.idx]
+        if p.get('hp', 0) <= 0:
+            self._steer(0.0, 0.0)
+            return
+        px, py = p['pos']
+
+        # threats: nearest enemy body and nearest incoming enemy bullet
+        dx = dy = 0.0
+        best = self.flee_radius * self.flee_radius
+        for e in scene.enemies:
+            ex, ey = e['pos']
+            d = (ex - px) ** 2 + (ey - py) ** 2
+            if d < best:
+                best = d
+                dx, dy = px - ex, py - ey
+        dodge = self.dodge_radius * self.dodge_radius
+        for eb in scene.enemy_bullets:
+            bx, by = eb['pos']
+            d = (bx - px) ** 2 + (by - py) ** 2
+            if d < dodge:
+                dodge = d
+                # sidestep perpendicular to the bullet's heading
+                vx, vy = eb['vel']
+                side = 1.0 if (px - bx) * vy - (py - by) * vx > 0 else -1.0
+                dx, dy = -vy * side * 100.0, vx * side * 100.0
+
+        if dx == 0.0 and dy == 0.0:
+            self._wander_timer -= dt
+            if self._wander_timer <= 0.0:
+                ang = self.rng.uniform(0, math.pi * 2)
+                self._wander = (math.cos(ang), math.sin(ang))
+                self._wander_timer = self.rng.uniform(0.8, 2.0)
+            dx, dy = self._wander
+        # drift back toward the middle when hugging a wall
+        w, h = getattr(scene, 'world_size', (800, 600))
+        if px < 60 or px > w - 60:
+            dx = (w / 2 - px)
+        if py < 60 or py > h - 60:
+            dy = (h / 2 - py)
+        self._steer(dx, dy)
+
+        scene._fire_bullet(self.idx)
+        if p.get('character') == 'mage':
+            if scene.now >= p.get('mage_ready_at', 0.0) and scene.enemies:
+                scene._activate_ult(self.idx)
+        elif p.get('ult_charge', 0) >= p.get('ult_max', 100):
+            scene._activate_ult(self.idx)
+
+    def _steer(self, dx, dy):
+        mv = self.scene._move[self.idx]
+        mag = math.hypot(dx, dy)
+        if mag < 1e-6:
+            mv['left'] = mv['right'] = mv['up'] = mv['down'] = False
+            return
+        dx /= mag
+        dy /= mag
+        mv['left'] = dx < -0.38
+        mv['right'] = dx > 0.38
+        mv['up'] = dy < -0.38
+        mv['down'] = dy > 0.38
@@ -0,0 +1,46 @@
+import math
+
+
+def sweep_circle(x0, y0, dx, dy, cx, cy, r):
+    """Earliest fraction t in [0, 1] at which the point moving from (x0, y0)
+    by (dx, dy) comes within r of (cx, cy), or None if it never does.
+
+    Sweeping a circle of radius ra against one of radius rb is the same test
+    with r = ra + rb. Returns 0.0 when the start point already overlaps.
+    """
+    fx = x0 - cx
+    fy = y0 - cy
+    c = fx * fx + fy * fy - r * r
+    if c < 0.0:
+        return 0.0
+    b = fx * dx + fy * dy
+    if b >= 0.0:
+        # moving away from (or tangent to) the circle
+        return None
+    a = dx * dx + dy * dy
+    disc = b * b - a * c
+    if disc < 0.0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1.0 else None
+
+
+def first_hit(x0, y0, dx, dy, entities, r):
+    """(entity, t) for the entity whose 'pos' the moving point reaches first
+    within radius r during this step, or (None, None).
+
+    Targets are treated as stationary at their current position; bullets
+    outrun everything they can hit, so only the projectile is swept. Ties
+    go to the earlier entity in the list, matching the old overlap test.
+    """
+    best = None
+    best_t = None
+    for ent in entities:
+        cx, cy = ent['pos']
+        t = sweep_circle(x0, y0, dx, dy, cx, cy, r)
+        if t is not None and (best_t is None or t < best_t):
+            best = ent
+            best_t = t
+            if t == 0.0:
+                break
+    return best, best_t
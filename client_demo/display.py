@@ -0,0 +1,124 @@
+import pygame
+
+
+_active = None
+
+
+def parse_size(text):
+    # '1280x720' -> (1280, 720)
+    w, _, h = text.lower().partition('x')
+    return int(w), int(h)
+
+
+def mouse_pos():
+    # mouse position in canvas coordinates (window pixels when no Display is active)
+    if _active is not None:
+        return _active.to_canvas(pygame.mouse.get_pos())
+    return pygame.mouse.get_pos()
+
+
+class Display:
+    """Fixed-size canvas the scenes draw into, shown in a window of any size.
+
+    Scenes and the playfield only ever see the canvas (the internal render
+    resolution), so their coordinates and fill-rate cost do not depend on
+    the window or monitor. scaler picks how the canvas reaches the window:
+
+      'sdl'       pygame.SCALED; SDL sizes the window, scales on the GPU
+                  and maps the mouse itself
+      'software'  transform.scale into a letterboxed area of the window
+      'smooth'    like software but with transform.smoothscale
+
+    A window the same size as the canvas (and not fullscreen) is opened
+    as a plain window with no scaling step at all. If SDL scaling is not
+    available the software path is used.
+
+    vsync asks SDL to make flip() wait for the monitor refresh. SDL only
+    offers it together with SCALED, so it implies the 'sdl' scaler; where
+    it cannot be had the window opens without it (self.vsync says which).
+    """
+
+    def __init__(self, canvas_size=(800, 600), window_size=None, fullscreen=False, scaler='sdl', vsync=False):
+        global _active
+        self.canvas_size = tuple(canvas_size)
+        window_size = tuple(window_size) if window_size else self.canvas_size
+        self.scaler = scaler
+        self.fullscreen = fullscreen
+        self.vsync = False
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        if vsync:
+            try:
+                pygame.display.set_mode(self.canvas_size, pygame.SCALED | pygame.RESIZABLE | flags, vsync=1)
+                self.vsync = True
+            except (pygame.error, TypeError):
+                pass
+        if self.vsync:
+            self.scaler = 'sdl'
+        elif window_size == self.canvas_size and not fullscreen:
+            self.scaler = 'none'
+        elif scaler == 'sdl':
+            try:
+                pygame.display.set_mode(self.canvas_size, pygame.SCALED | pygame.RESIZABLE | flags)
+            except pygame.error:
+                self.scaler = 'software'
+        if self.scaler in ('none', 'sdl'):
+            if self.scaler == 'none':
+                pygame.display.set_mode(self.canvas_size)
+            self.window = pygame.display.get_surface()
+            self.canvas = self.window
+        else:
+            self.window = pygame.display.set_mode((0, 0) if fullscreen else window_size, flags | pygame.RESIZABLE)
+            self.canvas = pygame.Surface(self.canvas_size).convert()
+        self._dest = None
+        self._dest_for = None
+        _active = self
+
+    @property
+    def scaled(self):
+        return self.canvas is not self.window
+
+    def dest_rect(self):
+        # largest canvas-aspect rect centred in the window (letterboxing)
+        win = self.window.get_size()
+        if self._dest_for != win:
+            cw, ch = self.canvas_size
+            k = min(win[0] / cw, win[1] / ch)
+            rect = pygame.Rect(0, 0, max(1, int(cw * k)), max(1, int(ch * k)))
+            rect.center = (win[0] // 2, win[1] // 2)
+            self._dest = rect
+            self._dest_for = win
+            # the bars are cleared once here, not every frame
+            self.window.fill((0, 0, 0))
+        return self._dest
+
+    def to_canvas(self, pos):
+        if not self.scaled:
+            return pos
+        dest = self.dest_rect()
+        cw, ch = self.canvas_size
+        x = (pos[0] - dest.x) * cw // dest.w
+        y = (pos[1] - dest.y) * ch // dest.h
+        return (min(max(x, 0), cw - 1), min(max(y, 0), ch - 1))
+
+    def map_event(self, event):
+        # mouse events with pos in canvas coordinates
+        if not self.scaled or not hasattr(event, 'pos'):
+            return event
+        attrs = dict(event.dict)
+        attrs['pos'] = self.to_canvas(event.pos)
+        return pygame.event.Event(event.type, attrs)
+
+    def present(self):
+        if not self.scaled:
+            return
+        self.window = pygame.display.get_surface()
+        dest = self.dest_rect()
+        target = self.window.subsurface(dest)
+        if self.scaler == 'smooth':
+            pygame.transform.smoothscale(self.canvas, dest.size, target)
+        else:
+            pygame.transform.scale(self.canvas, dest.size, target)
+
+    def flip(self):
+        self.present()
+        pygame.display.flip()
@@ -0,0 +1,100 @@
+import gc
+import time
+
+
+class GCPolicy:
+    """Keeps the cyclic garbage collector out of the middle of busy frames.
+
+    - startup / scene_entered: full collection, then gc.freeze() so the
+      long-lived scene graph is never scanned again.
+    - busy frames (an active wave): automatic collection is disabled; only
+      if the young generation gets very large is a gen-0 pass forced.
+    - idle frames (menus, waiting screen, boss-slain / post-boss pause):
+      automatic collection is re-enabled and one explicit generation is
+      collected per frame (0, then 1, then a single full pass per window).
+    - wave transitions: an explicit gen-1 pass while the new wave is built.
+
+    Every pause, automatic or explicit, is timed through gc.callbacks and
+    published to the perf overlay.
+    """
+
+    def __init__(self, perf=None, max_pending=20000, history=120):
+        self.perf = perf
+        self.max_pending = max_pending
+        self.history = history
+        self.pauses = []
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.forced = 0
+        self._t0 = None
+        self._manual = False
+        self._busy = False
+        self._idle_step = 0
+        gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._t0 = time.perf_counter()
+            return
+        if self._t0 is None:
+            return
+        ms = (time.perf_counter() - self._t0) * 1000.0
+        self._t0 = None
+        self.pauses.append((info.get('generation', -1), ms, self._manual))
+        del self.pauses[:-self.history]
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self._publish()
+
+    def _publish(self):
+        if self.perf is None or not self.pauses:
+            return
+        gen, ms, manual = self.pauses[-1]
+        kind = 'explicit' if manual else 'auto'
+        self.perf.counters['gc'] = f'gc: {"busy" if self._busy else "idle"}  last g{gen} {ms:.2f}ms {kind}  max {self.max_ms:.2f}ms  n={len(self.pauses)}'
+
+    def collect(self, generation=2):
+        self._manual = True
+        try:
+            return gc.collect(generation)
+        finally:
+            self._manual = False
+
+    def startup(self):
+        self.collect()
+        gc.freeze()
+
+    def scene_entered(self, scene):
+        # transitions are already a visible pause, so do the expensive work here
+        gc.unfreeze()
+        self.collect()
+        gc.freeze()
+        self._idle_step = 3
+
+    def wave_started(self, scene):
+        self.collect(1)
+
+    def frame(self, scene):
+        busy = not getattr(scene, 'gc_idle', True)
+        if busy:
+            if not self._busy:
+                gc.disable()
+                self._busy = True
+            if gc.get_count()[0] > self.max_pending:
+                # safety valve so a long wave cannot accumulate unbounded garbage
+                self.forced += 1
+                self.collect(0)
+            return
+        if self._busy:
+            gc.enable()
+            self._busy = False
+            self._idle_step = 0
+        # one slice of explicit collection per idle frame
+        if self._idle_step < 3:
+            self.collect(self._idle_step)
+            self._idle_step += 1
+
+    def close(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        gc.enable()
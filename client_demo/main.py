@@ -1,5 +1,7 @@
 import sys
 import os
+import time
+import argparse
 import pygame
 
 from scenes.login import LoginScene
@@ -8,16 +10,77 @@ from scenes.game import GameScene
 from scenes.saves import SavesScene
 from scenes.character_select import CharacterSelectScene
 from scenes.map_select import MapSelectScene
+from scenes.net_game import NetGameScene
+from scenes.stress import StressScene
 from save_manager import SaveManager
+from perf import FramePerf
+from profiling import ProfilerHooks
+from memtrack import MemoryTracker
+from gc_policy import GCPolicy
+from assets import AssetManager
+from render_backend import PygameBackend, NullBackend, RecordingBackend
+from quality import QualityGovernor
+from display import Display, parse_size
+from pipeline import SimPipeline
+from pacer import FramePacer
+from shared_world import WorldPublisher, DEFAULT_NAME
+
+
+def make_backend(mode, screen):
+	if mode == 'null':
+		return NullBackend(screen.get_size())
+	if mode == 'record':
+		return RecordingBackend(PygameBackend(screen))
+	return PygameBackend(screen)
 
 
 class SceneManager:
-	def __init__(self, screen, fps=60):
+	def __init__(self, screen, fps=60, display=None):
+		# screen is the canvas scenes draw into; display (if any) scales it to the window
 		self.screen = screen
-		self.clock = pygame.time.Clock()
+		self.display = display
 		self.fps = fps
+		# waits out each frame and smooths the dt handed to the scenes;
+		# CLIENT_PACING=sleep|busy|hybrid|vsync trades CPU for steadier frames
+		self.pacer = FramePacer(fps, os.environ.get('CLIENT_PACING', 'sleep'))
 		self.scenes = {}
 		self.current = None
+		self.current_name = None
+		# per-phase frame timers; F3 toggles the overlay, F4 dumps a CSV
+		self.perf = FramePerf(enabled=bool(os.environ.get('CLIENT_PERF')))
+		self.perf_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perf_logs')
+		# cProfile / sampling profiler per scene (F5, or CLIENT_PROFILE=cprofile|sample)
+		self.profiler = ProfilerHooks()
+		# tracemalloc growth tracking at wave boundaries (F6, or CLIENT_MEMTRACK=1)
+		self.memtrack = MemoryTracker()
+		# keeps generational GC out of busy frames; pauses go to the overlay
+		self.gc = GCPolicy(self.perf)
+		# background asset loading shared by all scenes; poll() finishes loads each frame
+		self.assets = AssetManager()
+		# what scenes render into: CLIENT_RENDER=null draws nothing (isolates
+		# update cost), CLIENT_RENDER=record also counts draw calls per frame
+		self.gfx = make_backend(os.environ.get('CLIENT_RENDER', ''), screen)
+		# steps visual quality down when frames overrun the budget and back up
+		# with hysteresis (CLIENT_QUALITY=off or a level name/index pins it)
+		self.quality = QualityGovernor(1000.0 / fps, mode=os.environ.get('CLIENT_QUALITY', 'auto'))
+		# CLIENT_PIPELINE=1 simulates the next tick on a worker thread while
+		# the main thread renders the previous one (scenes with pipelined=True)
+		self.pipeline = SimPipeline(self.perf.enabled) if os.environ.get('CLIENT_PIPELINE') else None
+		if self.pipeline is not None:
+			self.perf.add_phase('sim_wait')
+		# CLIENT_SHM=1 (or a block name) publishes players, enemies and
+		# projectiles into shared memory every tick (shared_world.WorldReader)
+		shm = os.environ.get('CLIENT_SHM')
+		self.publisher = WorldPublisher(DEFAULT_NAME if shm == '1' else shm) if shm else None
+		# per-tick rewind history in GameScene (F7); copying the world every
+		# tick costs real time under load, so it is off unless CLIENT_REWIND=1
+		# or the first F7 press turns it on
+		self.rewind = bool(os.environ.get('CLIENT_REWIND'))
+		self.frame_no = 0
+		# time the last frame spent working (not waiting in the pacer, nor
+		# for the refresh inside flip() with vsync); feeds the quality
+		# governor and the stress test
+		self.work_ms = 0.0
 
 	def register(self, name, scene):
 		self.scenes[name] = scene
@@ -39,18 +102,27 @@ class SceneManager:
 					self.screen.fill((0, 0, 0))
 			fade_surf.fill((0, 0, 0, a))
 			self.screen.blit(fade_surf, (0, 0))
-			pygame.display.flip()
-			self.clock.tick(self.fps)
+			self.flip()
+			self.pacer.tick()
 
 		if self.current:
+			self.profiler.scene_exited(self.current)
+			self.memtrack.snapshot('exit', self.current_name, self.current)
 			try:
 				self.current.on_exit()
 			except Exception:
 				pass
 
+		if self.pipeline is not None:
+			# frames published for the old scene (or an earlier visit) are stale
+			self.pipeline.detach()
 		self.current = next_scene
+		self.current_name = name
 		if self.current:
 			self.current.on_enter(**kwargs)
+			self.gc.scene_entered(self.current)
+			self.profiler.scene_entered(name, self.current)
+			self.memtrack.snapshot('enter', name, self.current)
 
 		# fade in
 		for a in range(255, -1, -30):
@@ -60,42 +132,171 @@ class SceneManager:
 				self.screen.fill((0, 0, 0))
 			fade_surf.fill((0, 0, 0, a))
 			self.screen.blit(fade_surf, (0, 0))
+			self.flip()
+			self.pacer.tick()
+
+	def handle_debug_key(self, event):
+		# engine-level hotkeys; returns True when the event was consumed
+		if event.type != pygame.KEYDOWN:
+			return False
+		if event.key == pygame.K_F3:
+			self.perf.toggle_overlay()
+			if self.pipeline is not None:
+				self.pipeline.perf.enabled = self.perf.enabled
+			return True
+		if event.key == pygame.K_F4:
+			path = os.path.join(self.perf_dir, f'frames_{int(time.time())}.csv')
+			print(f'frame timings written to {self.perf.export_csv(path)}')
+			if self.pipeline is not None:
+				# the simulation thread's own sub-phase timings
+				path = os.path.join(self.perf_dir, f'sim_{int(time.time())}.csv')
+				print(f'simulation timings written to {self.pipeline.perf.export_csv(path)}')
+			return True
+		if event.key == pygame.K_F5:
+			mode = 'sample' if event.mod & pygame.KMOD_SHIFT else 'cprofile'
+			self.profiler.toggle(mode, self.current_name, self.current)
+			return True
+		if event.key == pygame.K_F6:
+			print('memory tracking', 'on' if self.memtrack.toggle() else 'off')
+			return True
+		if event.key == pygame.K_F7 and hasattr(self.current, 'rewind'):
+			history = self.current.history
+			if not history.enabled:
+				# nothing recorded yet: start recording, rewind on the next press
+				self.rewind = history.enabled = True
+				print('rewind history on; press F7 again to rewind')
+				return True
+			# debug rewind of the simulation by two seconds
+			self.current.rewind(2.0)
+			return True
+		return False
+
+	def flip(self):
+		if self.display is not None:
+			self.display.flip()
+		else:
 			pygame.display.flip()
-			self.clock.tick(self.fps)
+
+	def wave_started(self, scene):
+		# called by GameScene whenever a new wave has been spawned
+		name = next((n for n, sc in self.scenes.items() if sc is scene), self.current_name)
+		self.memtrack.snapshot(f'wave {getattr(scene, "wave", "?")}', name, scene)
+		self.gc.wave_started(scene)
+
+	def quit(self):
+		# flush any running profiler before the process goes away
+		self.profiler.stop(self.current)
+		self.assets.close()
+		# give the interpreter its automatic GC (and gc.callbacks) back
+		self.gc.close()
+		if self.publisher is not None:
+			self.publisher.close()
+		pygame.quit()
+		sys.exit()
 
 	def run(self):
+		perf = self.perf
+		quality = self.quality
+		pipeline = self.pipeline
+		vsync = self.display is not None and self.display.vsync
 		while True:
-			dt = self.clock.tick(self.fps) / 1000.0
+			dt = self.pacer.tick()
+			work_start = time.perf_counter()
+			self.frame_no += 1
+			# at the lowest quality levels only every Nth frame is drawn
+			draw = self.frame_no % quality.settings['render_every'] == 0
+			perf.begin_frame()
+			if pipeline is not None:
+				# the simulation thread is idle while events are handled
+				pipeline.wait()
+				perf.lap('sim_wait')
 			for event in pygame.event.get():
+				if self.display is not None:
+					event = self.display.map_event(event)
 				if event.type == pygame.QUIT:
-					pygame.quit()
-					sys.exit()
+					self.quit()
+				if self.handle_debug_key(event):
+					continue
 				if self.current:
 					self.current.handle_event(event)
+			perf.lap('events')
 
 			if self.current:
-				self.current.update(dt)
-				self.current.render(self.screen)
-				# render modal if present
-				if getattr(self.current, 'modal', None):
-					try:
-						self.current.modal.render(self.screen)
-					except Exception:
-						pass
+				self.gc.frame(self.current)
+				perf.lap('gc')
+				self.assets.poll()
+				frame = None
+				if pipeline is not None and getattr(self.current, 'pipelined', False):
+					# tick N+1 runs in the background while tick N is drawn
+					frame = pipeline.step(self.current, dt)
+				else:
+					self.current.update(dt)
+					perf.lap('update')
+				if draw:
+					gfx = self.gfx
+					if isinstance(gfx, RecordingBackend):
+						gfx.begin_frame()
+					if frame is None:
+						self.current.render(gfx)
+					else:
+						self.current.render(gfx, frame)
+					if isinstance(gfx, RecordingBackend):
+						perf.counters['draw'] = f'draw: {gfx.calls()} calls  {gfx.counts["items"]} batched  max {gfx.max_calls()}'
+					# render modal if present
+					if getattr(self.current, 'modal', None):
+						try:
+							self.current.modal.render(self.screen)
+						except Exception:
+							pass
+					perf.lap('render')
 
-			pygame.display.flip()
+			work_end = None
+			if draw:
+				if perf.overlay:
+					perf.counters['quality'] = quality.status()
+					if pipeline is not None:
+						perf.counters['pipeline'] = pipeline.status()
+					perf.counters['pacing'] = self.pacer.status()
+					perf.render_overlay(self.screen, 1000.0 / self.fps)
+					perf.lap('overlay')
+
+				if vsync:
+					# flip() blocks until the refresh: that is waiting, not work
+					work_end = time.perf_counter()
+				self.flip()
+				perf.lap('flip')
+			perf.end_frame()
+			self.work_ms = ((work_end or time.perf_counter()) - work_start) * 1000.0
+			quality.frame(self.work_ms)
+
+
+def parse_args(argv=None):
+	parser = argparse.ArgumentParser(description='Pygame Client Framework')
+	parser.add_argument('--connect', metavar='HOST:PORT', help='join a server.py game instead of playing locally')
+	parser.add_argument('--name', default='Player', help='player name used with --connect')
+	parser.add_argument('--spectate', action='store_true', help='with --connect, watch without taking a player slot')
+	parser.add_argument('--character', default='warrior', choices=['warrior', 'mage', 'rogue'])
+	parser.add_argument('--resolution', type=parse_size, default=(800, 600), metavar='WxH', help='internal render resolution scenes draw at')
+	parser.add_argument('--window', type=parse_size, metavar='WxH', help='window size (defaults to the render resolution)')
+	parser.add_argument('--fullscreen', action='store_true')
+	parser.add_argument('--scaler', default='sdl', choices=['sdl', 'software', 'smooth'], help='how the render resolution is scaled to the window')
+	return parser.parse_args(argv)
 
 
 def main():
+	args = parse_args()
 	os.environ.setdefault('SDL_VIDEO_CENTERED', '1')
 	pygame.init()
-	WIDTH, HEIGHT = 800, 600
-	screen = pygame.display.set_mode((WIDTH, HEIGHT))
+	# scenes draw into a fixed-size canvas; a bigger window or fullscreen
+	# only changes the final scaling step, not what is rendered
+	vsync = os.environ.get('CLIENT_PACING') == 'vsync'
+	display = Display(args.resolution, args.window, args.fullscreen, args.scaler, vsync)
+	screen = display.canvas
 	pygame.display.set_caption('Pygame Client Framework')
 
 	save_mgr = SaveManager(os.path.join(os.path.dirname(__file__), 'saves'))
 
-	manager = SceneManager(screen)
+	manager = SceneManager(screen, display=display)
 
 	# create scenes
 	login = LoginScene(screen, save_mgr)
@@ -104,6 +305,8 @@ def main():
 	character = CharacterSelectScene(screen, save_mgr)
 	map_scene = MapSelectScene(screen, save_mgr)
 	saves = SavesScene(screen, save_mgr)
+	net_game = NetGameScene(screen, save_mgr)
+	stress = StressScene(screen, save_mgr)
 
 	manager.register('login', login)
 	manager.register('menu', menu)
@@ -111,8 +314,16 @@ def main():
 	manager.register('character_select', character)
 	manager.register('map_select', map_scene)
 	manager.register('saves', saves)
+	manager.register('net_game', net_game)
+	manager.register('stress', stress)
+	# everything built so far lives for the whole session
+	manager.gc.startup()
 
-	manager.goto('login')
+	if args.connect:
+		host, _, port = args.connect.rpartition(':')
+		manager.goto('net_game', host=host or '127.0.0.1', port=int(port), username=args.name, character=args.character, spectate=args.spectate)
+	else:
+		manager.goto('login')
 	try:
 		manager.run()
 	except Exception:
@@ -0,0 +1,105 @@
+import os
+import time
+import tracemalloc
+
+
+class MemoryTracker:
+    """tracemalloc snapshots at wave boundaries and scene transitions.
+
+    Each snapshot is diffed against the previous one of the same scene and
+    the top growing allocation sites are logged together with the scene's
+    live-entity counts. A series (traced bytes or any entity count) that grew
+    at every one of the last `window` snapshots is flagged as a suspected
+    leak. Enable with CLIENT_MEMTRACK=1 or toggle with F6; tracing slows
+    allocation down noticeably, so it is off by default.
+    """
+
+    def __init__(self, out_dir=None, top=10, window=4, nframes=8):
+        self.out_dir = out_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perf_logs')
+        self.top = top
+        self.window = window
+        self.nframes = nframes
+        self.log_path = None
+        self._last = {}
+        self._history = {}
+        self.flagged = set()
+        if os.environ.get('CLIENT_MEMTRACK'):
+            self.start()
+
+    @property
+    def enabled(self):
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.nframes)
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.log_path = os.path.join(self.out_dir, f'memtrack_{int(time.time())}.log')
+        self._last = {}
+        self._history = {}
+        self.flagged = set()
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._last = {}
+
+    def toggle(self):
+        if self.enabled:
+            self.stop()
+        else:
+            self.start()
+        return self.enabled
+
+    def _take(self):
+        snap = tracemalloc.take_snapshot()
+        return snap.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ))
+
+    def snapshot(self, label, scene_name, scene=None):
+        # returns the list of report lines (empty when tracing is off)
+        if not self.enabled:
+            return []
+        snap = self._take()
+        current, peak = tracemalloc.get_traced_memory()
+        counts = scene.entity_counts() if hasattr(scene, 'entity_counts') else {}
+        lines = [f'[{time.strftime("%H:%M:%S")}] {scene_name}: {label}  traced={current / 1024:.1f} KiB peak={peak / 1024:.1f} KiB']
+        if counts:
+            lines.append('  live: ' + '  '.join(f'{k}={v}' for k, v in counts.items()))
+
+        prev = self._last.get(scene_name)
+        if prev is not None:
+            growing = [st for st in snap.compare_to(prev, 'lineno') if st.size_diff > 0][:self.top]
+            for st in growing:
+                frame = st.traceback[0]
+                lines.append(f'  +{st.size_diff / 1024:8.1f} KiB  +{st.count_diff:6d} blocks  {frame.filename}:{frame.lineno}')
+        self._last[scene_name] = snap
+
+        series = dict(counts)
+        series['traced_bytes'] = current
+        hist = self._history.setdefault(scene_name, [])
+        hist.append(series)
+        del hist[:-(self.window + 1)]
+        for key in self._monotonic(hist):
+            lines.append(f'  WARNING: {key} grew at each of the last {self.window} snapshots ({hist[0][key]} -> {hist[-1][key]})')
+            if (scene_name, key) not in self.flagged:
+                self.flagged.add((scene_name, key))
+                print(f'memtrack: {scene_name} {key} keeps growing ({hist[0][key]} -> {hist[-1][key]})')
+
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return lines
+
+    def _monotonic(self, hist):
+        if len(hist) <= self.window:
+            return []
+        out = []
+        for key in hist[-1]:
+            vals = [h.get(key, 0) for h in hist]
+            if all(b > a for a, b in zip(vals, vals[1:])):
+                out.append(key)
+        return out
@@ -0,0 +1,145 @@
+import math
+
+
+# neighbour steps (dc, dr): the four sides first, then the diagonals
+STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class Navigator:
+    """Steering around a tile map's solid tiles toward players.
+
+    Every player has a flow field: a breadth-first search out from the
+    player's cell (at most `radius` steps) that stores, for each reached
+    cell, the unit vector toward the neighbour one step closer to the
+    player. A field is rebuilt only when its player moves into another
+    cell, and any number of enemies then steer with one list lookup each
+    instead of searching a path of their own. Diagonal steps that would
+    cut a wall corner are never taken.
+
+    Maps without solid tiles need none of this; has_walls is False and
+    callers steer straight at their target.
+    """
+
+    def __init__(self, tilemap, radius=32):
+        self.tile = tilemap.tile
+        self.cols = tilemap.cols
+        self.rows = tilemap.rows
+        self.blocked = tilemap.solid
+        self.has_walls = any(self.blocked)
+        self.radius = radius
+        # player index -> (cell, flow list)
+        self.fields = {}
+        self.rebuilds = 0
+        self._links = None
+
+    def cell_of(self, x, y):
+        # grid index under world position (x, y), or -1 outside the map
+        c = int(x // self.tile)
+        r = int(y // self.tile)
+        if 0 <= c < self.cols and 0 <= r < self.rows:
+            return r * self.cols + c
+        return -1
+
+    def blocked_at(self, x, y):
+        # solid tile (or off the map) under world position (x, y)
+        cell = self.cell_of(x, y)
+        return cell < 0 or self.blocked[cell]
+
+    def _neighbour_links(self):
+        # per open cell: (neighbour, unit vector from the neighbour back to
+        # the cell) for every open neighbour reachable without corner cutting;
+        # built once per map, on first use
+        if self._links is None:
+            cols, rows, blocked = self.cols, self.rows, self.blocked
+            inv = 1.0 / math.sqrt(2.0)
+            links = [()] * (cols * rows)
+            for r in range(rows):
+                for c in range(cols):
+                    cell = r * cols + c
+                    if blocked[cell]:
+                        continue
+                    out = []
+                    for dc, dr in STEPS:
+                        nc, nr = c + dc, r + dr
+                        if not (0 <= nc < cols and 0 <= nr < rows) or blocked[nr * cols + nc]:
+                            continue
+                        if dc and dr:
+                            if blocked[r * cols + nc] or blocked[nr * cols + c]:
+                                continue
+                            out.append((nr * cols + nc, (-dc * inv, -dr * inv)))
+                        else:
+                            out.append((nr * cols + nc, (float(-dc), float(-dr))))
+                    links[cell] = tuple(out)
+            self._links = links
+        return self._links
+
+    def _build(self, target):
+        links = self._neighbour_links()
+        flow = [None] * (self.cols * self.rows)
+        # the target cell itself has no direction: steer straight at the player
+        flow[target] = ()
+        frontier = [target]
+        for _ in range(self.radius):
+            nxt = []
+            append = nxt.append
+            for cell in frontier:
+                for n, d in links[cell]:
+                    if flow[n] is None:
+                        flow[n] = d
+                        append(n)
+            if not nxt:
+                break
+            frontier = nxt
+        self.rebuilds += 1
+        return flow
+
+    def update(self, players):
+        # rebuild the fields of players that changed cell; players that are
+        # down, off the map or standing in a wall have none
+        if not self.has_walls:
+            return
+        fields = self.fields
+        for i, p in enumerate(players):
+            cell = self.cell_of(p['pos'][0], p['pos'][1])
+            if p.get('hp', 0) <= 0 or cell < 0 or self.blocked[cell]:
+                fields.pop(i, None)
+                continue
+            field = fields.get(i)
+            if field is None or field[0] != cell:
+                fields[i] = (cell, self._build(cell))
+        for i in [i for i in fields if i >= len(players)]:
+            del fields[i]
+
+    def direction(self, index, x, y):
+        # unit vector to follow from (x, y) toward player `index`, or None
+        # where its field does not help (no walls, out of range, same cell)
+        field = self.fields.get(index)
+        if field is None:
+            return None
+        cell = self.cell_of(x, y)
+        if cell < 0:
+            return None
+        return field[1][cell] or None
+
+    def nearest_open(self, x, y):
+        # (x, y) itself when it is open, else the centre of the closest open cell
+        start = self.cell_of(min(max(x, 0), self.cols * self.tile - 1), min(max(y, 0), self.rows * self.tile - 1))
+        if not self.blocked[start]:
+            return x, y
+        cols, rows, blocked = self.cols, self.rows, self.blocked
+        seen = {start}
+        frontier = [start]
+        while frontier:
+            nxt = []
+            for cell in frontier:
+                r, c = divmod(cell, cols)
+                for dc, dr in STEPS[:4]:
+                    nc, nr = c + dc, r + dr
+                    n = nr * cols + nc
+                    if 0 <= nc < cols and 0 <= nr < rows and n not in seen:
+                        if not blocked[n]:
+                            return (nc + 0.5) * self.tile, (nr + 0.5) * self.tile
+                        seen.add(n)
+                        nxt.append(n)
+            frontier = nxt
+        return x, y
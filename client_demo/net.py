@@ -0,0 +1,68 @@
+import json
+import struct
+
+# wire format: u32 big-endian length (of kind + payload), u8 kind, payload
+HEADER = struct.Struct('!IB')
+MAX_FRAME = 1 << 20
+
+# client -> server
+JOIN = 1      # json {'name', 'character', 'spectate'}
+INPUT = 2     # INPUT_FMT
+BYE = 3
+ACK = 4       # ACK_FMT: last snapshot sequence decoded
+# server -> client
+WELCOME = 10  # json {'player', 'tick_rate'}
+STATE = 11    # delta-compressed world snapshot, see snapshot.py
+FULL = 12     # json {'reason'}
+
+# input buttons bitmask
+LEFT, RIGHT, UP, DOWN, FIRE, ULT = 1, 2, 4, 8, 16, 32
+INPUT_FMT = struct.Struct('!IB')  # seq, buttons
+ACK_FMT = struct.Struct('!I')
+
+
+def frame(kind, payload=b''):
+    return HEADER.pack(len(payload) + 1, kind) + payload
+
+
+def json_frame(kind, obj):
+    return frame(kind, json.dumps(obj, separators=(',', ':')).encode('utf-8'))
+
+
+def input_frame(seq, buttons):
+    return frame(INPUT, INPUT_FMT.pack(seq & 0xFFFFFFFF, buttons))
+
+
+def ack_frame(seq):
+    return frame(ACK, ACK_FMT.pack(seq))
+
+
+async def read_frame(reader):
+    # asyncio side; returns (kind, payload, wire_bytes) or raises IncompleteReadError
+    head = await reader.readexactly(HEADER.size)
+    length, kind = HEADER.unpack(head)
+    if length < 1 or length > MAX_FRAME:
+        raise ValueError(f'bad frame length {length}')
+    payload = await reader.readexactly(length - 1)
+    return kind, payload, HEADER.size + length - 1
+
+
+class FrameBuffer:
+    """Incremental decoder for the blocking-socket client."""
+
+    def __init__(self):
+        self._buf = bytearray()
+
+    def feed(self, data):
+        self._buf += data
+        out = []
+        while len(self._buf) >= HEADER.size:
+            length, kind = HEADER.unpack_from(self._buf)
+            if length < 1 or length > MAX_FRAME:
+                raise ValueError(f'bad frame length {length}')
+            end = HEADER.size + length - 1
+            if len(self._buf) < end:
+                break
+            out.append((kind, bytes(self._buf[HEADER.size:end])))
+            del self._buf[:end]
+        return out
@@ -0,0 +1,135 @@
+import time
+import pygame
+
+
+MODES = ('sleep', 'busy', 'hybrid', 'vsync')
+
+
+class FramePacer:
+    """Waits for the next frame and hands the simulation a steady dt.
+
+    mode (CLIENT_PACING) trades CPU for smoothness:
+
+      'sleep'   clock.tick(); no CPU spent waiting, but the OS sleep is
+                coarse (1ms or worse), so frames land late by a varying amount
+      'busy'    clock.tick_busy_loop(); no sleep jitter, one core spins all
+                frame (pygame's Clock counts whole ms, so 60 fps is 16ms)
+      'hybrid'  time.sleep() until spin_ms before the deadline, then spin;
+                deadlines are absolute, so lateness does not accumulate
+      'vsync'   display.flip() blocks on the refresh (the window is opened
+                with vsync); frames that come back early anyway (no vsync
+                available) fall back to the hybrid wait
+
+    A measured interval within `snap` (a fraction of the target) of the
+    target is passed on as exactly the target, so timer noise never
+    reaches the simulation; real hitches still come through in full.
+    The time snapped away is kept and handed out with the next dt once it
+    grows past the snap window, so the dts always add up to the elapsed
+    time to within snap x the target (a steady 55 fps still simulates
+    55 fps worth of time, not 60).
+    The last `size` intervals are kept for stats(): deviation from the
+    target, missed deadlines (an interval over 1.5 x the target, i.e. a
+    refresh skipped) and the share of time spent spinning.
+    """
+
+    def __init__(self, fps=60, mode='sleep', spin_ms=2.0, snap=0.1, size=240):
+        self.fps = fps
+        self.mode = mode if mode in MODES else 'sleep'
+        self.interval = 1.0 / fps
+        self.spin = spin_ms / 1000.0
+        self.snap = snap
+        self.clock = pygame.time.Clock()
+        self.size = size
+        self._ring = [0.0] * size
+        self.index = 0
+        self.count = 0
+        self.frames = 0
+        self.missed = 0
+        self.spun = 0.0
+        self._start = None
+        self._last = None
+        self._next = None
+        # elapsed time not handed out yet (negative: handed out ahead)
+        self._debt = 0.0
+
+    def _wait_until(self, deadline):
+        remaining = deadline - time.perf_counter()
+        if remaining > self.spin:
+            time.sleep(remaining - self.spin)
+        start = time.perf_counter()
+        while time.perf_counter() < deadline:
+            pass
+        self.spun += time.perf_counter() - start
+
+    def tick(self):
+        # wait for the next frame; returns the dt (seconds) to simulate
+        mode = self.mode
+        if mode == 'sleep':
+            self.clock.tick(self.fps)
+        elif mode == 'busy':
+            start = time.perf_counter()
+            self.clock.tick_busy_loop(self.fps)
+            self.spun += time.perf_counter() - start
+        else:
+            now = time.perf_counter()
+            if mode == 'vsync':
+                # flip() should already have waited; only make up for it when it did not
+                if self._last is not None and now - self._last < self.interval * 0.75:
+                    self._wait_until(self._last + self.interval)
+            else:
+                deadline = self._next
+                if deadline is None or now - deadline > self.interval:
+                    # first frame, or too far behind to catch up: start over from now
+                    deadline = now
+                elif now < deadline:
+                    self._wait_until(deadline)
+                self._next = deadline + self.interval
+        now = time.perf_counter()
+        if self._last is None:
+            self._start = self._last = now
+            return self.interval
+        interval = now - self._last
+        self._last = now
+        self._ring[self.index] = interval
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        self.frames += 1
+        if interval > self.interval * 1.5:
+            self.missed += 1
+        window = self.interval * self.snap
+        if abs(interval - self.interval) > window:
+            return interval
+        self._debt += interval - self.interval
+        if abs(self._debt) <= window:
+            return self.interval
+        dt = self.interval + self._debt
+        self._debt = 0.0
+        return dt
+
+    def stats(self):
+        # pacing over the buffered frames (times in ms)
+        n = self.count
+        if not n:
+            return {}
+        target = self.interval
+        window = self._ring[:n]
+        dev = sorted(abs(v - target) for v in window)
+        elapsed = (self._last - self._start) or 1.0
+        return {
+            'mode': self.mode,
+            'target_ms': target * 1000.0,
+            'mean_ms': sum(window) / n * 1000.0,
+            'dev_p50_ms': dev[min(n - 1, int(n * 0.50))] * 1000.0,
+            'dev_p99_ms': dev[min(n - 1, int(n * 0.99))] * 1000.0,
+            'missed_recent': sum(1 for v in window if v > target * 1.5),
+            'missed': self.missed,
+            'frames': self.frames,
+            'spin_share': self.spun / elapsed,
+        }
+
+    def status(self):
+        s = self.stats()
+        if not s:
+            return f'pacing: {self.mode}'
+        return (f'pacing: {s["mode"]}  dev p50 {s["dev_p50_ms"]:.2f} p99 {s["dev_p99_ms"]:.2f}ms  '
+                f'missed {s["missed_recent"]}/{self.count}  spin {s["spin_share"] * 100:.0f}%')
@@ -0,0 +1,183 @@
+import math
+import random
+from array import array
+from itertools import islice
+import pygame
+
+
+# emitter presets: count, speed/life/size ranges, palette and cone
+# (spread is the full cone width in radians around the emit angle)
+EMITTERS = {
+    'kill': {
+        'count': 18, 'speed': (40.0, 160.0), 'life': (0.25, 0.6), 'size': (2, 4),
+        'colors': ((255, 200, 0), (255, 120, 0), (200, 60, 60)), 'spread': math.tau,
+    },
+    'boss_phase': {
+        'count': 120, 'speed': (60.0, 260.0), 'life': (0.6, 1.4), 'size': (2, 6),
+        'colors': ((200, 50, 200), (140, 40, 160), (255, 160, 255)), 'spread': math.tau,
+    },
+    'ult': {
+        'count': 90, 'speed': (160.0, 340.0), 'life': (0.3, 0.7), 'size': (2, 4),
+        'colors': ((60, 200, 220), (160, 240, 255), (255, 255, 255)), 'spread': math.tau,
+    },
+    'split': {
+        'count': 14, 'speed': (30.0, 120.0), 'life': (0.2, 0.45), 'size': (2, 3),
+        'colors': ((180, 100, 220), (220, 140, 200)), 'spread': 1.6,
+    },
+}
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored as parallel arrays.
+
+    Live particles are packed at the front of float32 arrays (x, y, vx, vy,
+    age, life) plus byte arrays for palette index and radius. Emitting
+    writes into free slots and fails silently when the pool is full;
+    update() integrates every live particle and compacts out the expired
+    ones in a single pass over the arrays, allocating nothing. draw() turns each particle into a
+    cached (colour, radius, fade level) sprite and hands the whole frame
+    to a single Surface.blits() call.
+    """
+
+    def __init__(self, capacity=4096, drag=1.5, fade_levels=8, emitters=None):
+        self.capacity = capacity
+        self.drag = drag
+        self.fade_levels = fade_levels
+        self.emitters = dict(EMITTERS if emitters is None else emitters)
+        self.enabled = True
+        # multiplier on every burst (lowered by the quality governor)
+        self.scale = 1.0
+        self.count = 0
+        self.dropped = 0
+        # own generator so cosmetic effects never shift gameplay randomness
+        self.rng = random.Random()
+        zeros = array('f', bytes(4 * capacity))
+        self.x = array('f', zeros)
+        self.y = array('f', zeros)
+        self.vx = array('f', zeros)
+        self.vy = array('f', zeros)
+        self.age = array('f', zeros)
+        self.life = array('f', zeros)
+        self.color = array('B', bytes(capacity))
+        self.size = array('B', bytes(capacity))
+        self.palette = []
+        self._palette_idx = {}
+        self._sprites = {}
+
+    def _color_index(self, rgb):
+        idx = self._palette_idx.get(rgb)
+        if idx is None:
+            idx = self._palette_idx[rgb] = len(self.palette)
+            self.palette.append(rgb)
+        return idx
+
+    def emit(self, name, x, y, angle=0.0, scale=1.0):
+        # spawn one preset burst at (x, y); returns the number actually spawned
+        if not self.enabled:
+            return 0
+        spec = self.emitters[name]
+        n = self.count
+        want = int(spec['count'] * scale * self.scale)
+        room = self.capacity - n
+        if want > room:
+            self.dropped += want - room
+            want = room
+        if want <= 0:
+            return 0
+        rng = self.rng
+        uniform = rng.uniform
+        smin, smax = spec['speed']
+        lmin, lmax = spec['life']
+        rmin, rmax = spec['size']
+        colors = [self._color_index(c) for c in spec['colors']]
+        half = spec.get('spread', math.tau) * 0.5
+        px, py, pvx, pvy = self.x, self.y, self.vx, self.vy
+        for i in range(n, n + want):
+            ang = angle + uniform(-half, half)
+            speed = uniform(smin, smax)
+            px[i] = x
+            py[i] = y
+            pvx[i] = math.cos(ang) * speed
+            pvy[i] = math.sin(ang) * speed
+            self.age[i] = 0.0
+            self.life[i] = uniform(lmin, lmax)
+            self.color[i] = rng.choice(colors)
+            self.size[i] = rng.randint(rmin, rmax)
+        self.count = n + want
+        return want
+
+    def clear(self):
+        self.count = 0
+
+    def frozen(self):
+        # drawable copy of the live particles that later updates do not
+        # touch (pipelined rendering); shares the palette and sprite cache
+        ps = ParticleSystem.__new__(ParticleSystem)
+        ps.__dict__.update(self.__dict__)
+        n = self.count
+        ps.x, ps.y, ps.age, ps.life = self.x[:n], self.y[:n], self.age[:n], self.life[:n]
+        ps.color, ps.size = self.color[:n], self.size[:n]
+        return ps
+
+    def update(self, dt):
+        # one in-place pass: integrate each particle and move the survivors
+        # down over the expired ones, keeping their order
+        n = self.count
+        if not n:
+            return
+        damp = max(0.0, 1.0 - self.drag * dt)
+        x, y, vx, vy, age = self.x, self.y, self.vx, self.vy, self.age
+        life, color, size = self.life, self.color, self.size
+        j = 0
+        for i in range(n):
+            a = age[i] + dt
+            lf = life[i]
+            if a >= lf:
+                continue
+            pvx = vx[i] * damp
+            pvy = vy[i] * damp
+            x[j] = x[i] + pvx * dt
+            y[j] = y[i] + pvy * dt
+            vx[j] = pvx
+            vy[j] = pvy
+            age[j] = a
+            if j != i:
+                life[j] = lf
+                color[j] = color[i]
+                size[j] = size[i]
+            j += 1
+        self.count = j
+
+    def _sprite(self, color, radius, level):
+        key = (color, radius, level)
+        spr = self._sprites.get(key)
+        if spr is None:
+            d = radius * 2
+            spr = pygame.Surface((d, d))
+            pygame.draw.circle(spr, self.palette[color], (radius, radius), radius)
+            if pygame.display.get_surface() is not None:
+                spr = spr.convert()
+            # colorkey + surface alpha (RLE) is much cheaper to blit than per-pixel alpha
+            spr.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+            spr.set_alpha(int(255 * (level + 1) / self.fade_levels), pygame.RLEACCEL)
+            self._sprites[key] = spr
+        return spr
+
+    def draw(self, surface, offset=(0, 0), limit=None):
+        # limit: draw at most this many (the oldest ones first)
+        n = self.count if limit is None else min(self.count, limit)
+        if not n:
+            return
+        levels = self.fade_levels
+        ox, oy = offset
+        sprites = self._sprites
+        make = self._sprite
+        batch = []
+        append = batch.append
+        for px, py, a, l, c, r in zip(self.x, self.y, self.age, self.life, self.color, islice(self.size, n)):
+            level = int(levels * (1.0 - a / l))
+            if level >= levels:
+                level = levels - 1
+            spr = sprites.get((c, r, level)) or make(c, r, level)
+            append((spr, (int(px) - r - ox, int(py) - r - oy)))
+        surface.blits(batch, False)
@@ -0,0 +1,190 @@
+import os
+import csv
+import time
+import pygame
+
+
+# phases in frame order; GameScene.update splits its own time into the
+# sub-phases between 'events' and 'update' (which then only holds the rest)
+PHASES = (
+    'events',
+    'gc',
+    'bots',
+    'players',
+    'spawns',
+    'enemies',
+    'bullets',
+    'enemy_bullets',
+    'collisions',
+    'timers',
+    'particles',
+    'history',
+    'publish',
+    'update',
+    'render',
+    'overlay',
+    'flip',
+)
+
+
+class FramePerf:
+    """Per-phase frame timers kept in a fixed-size ring buffer.
+
+    Timing uses a lap scheme: begin_frame() sets a mark and every lap(name)
+    charges the time since the previous mark to that phase. When disabled,
+    every call returns before touching the clock.
+    """
+
+    def __init__(self, size=240, enabled=False):
+        self.size = size
+        self.enabled = enabled
+        self.overlay = False
+        self.phases = list(PHASES)
+        self._slot = {name: i for i, name in enumerate(self.phases)}
+        self._rings = [[0.0] * size for _ in self.phases]
+        self._frame = [0.0] * size
+        self._cur = [0.0] * len(self.phases)
+        self.index = 0
+        self.count = 0
+        self._mark = 0.0
+        self._frame_start = 0.0
+        self._stats = {}
+        self._stats_age = 0
+        self.font = None
+        # one-line status strings other subsystems publish to the overlay
+        self.counters = {}
+
+    def add_phase(self, name):
+        if name in self._slot:
+            return
+        self._slot[name] = len(self.phases)
+        self.phases.append(name)
+        self._rings.append([0.0] * self.size)
+        self._cur.append(0.0)
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.enabled = self.overlay or bool(os.environ.get('CLIENT_PERF'))
+
+    # --- hot path ---
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        cur = self._cur
+        for i in range(len(cur)):
+            cur[i] = 0.0
+        self._mark = self._frame_start = time.perf_counter()
+
+    def lap(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._cur[self._slot[name]] += now - self._mark
+        self._mark = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        i = self.index
+        for ring, value in zip(self._rings, self._cur):
+            ring[i] = value
+        self._frame[i] = time.perf_counter() - self._frame_start
+        self.index = (i + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    # --- reporting ---
+    def _ordered(self, ring):
+        # oldest -> newest
+        if self.count < self.size:
+            return ring[:self.count]
+        return ring[self.index:] + ring[:self.index]
+
+    def frame_times(self):
+        return self._ordered(self._frame)
+
+    def percentiles(self):
+        # {phase: (p50_ms, p99_ms)} over the buffered frames
+        out = {}
+        n = self.count
+        if not n:
+            return out
+        rings = list(zip(self.phases, self._rings)) + [('frame', self._frame)]
+        for name, ring in rings:
+            vals = sorted(ring[:n])
+            p50 = vals[min(n - 1, int(n * 0.50))]
+            p99 = vals[min(n - 1, int(n * 0.99))]
+            out[name] = (p50 * 1000.0, p99 * 1000.0)
+        return out
+
+    def export_csv(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        columns = [self._ordered(r) for r in self._rings]
+        frames = self._ordered(self._frame)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            w = csv.writer(f)
+            w.writerow(['frame'] + [f'{p}_ms' for p in self.phases] + ['total_ms'])
+            for row in range(len(frames)):
+                w.writerow([row] + [f'{col[row] * 1000.0:.4f}' for col in columns] + [f'{frames[row] * 1000.0:.4f}'])
+            w.writerow([])
+            w.writerow(['phase', 'p50_ms', 'p99_ms'])
+            for name, (p50, p99) in self.percentiles().items():
+                w.writerow([name, f'{p50:.4f}', f'{p99:.4f}'])
+        return path
+
+    def render_overlay(self, surface, budget_ms=1000.0 / 60):
+        if not self.overlay:
+            return
+        if self.font is None:
+            self.font = pygame.font.SysFont('monospace', 13)
+        # percentiles are re-sorted a few times a second, not every frame
+        self._stats_age -= 1
+        if self._stats_age <= 0:
+            self._stats = self.percentiles()
+            self._stats_age = 15
+
+        graph_w, graph_h = 240, 60
+        panel = pygame.Rect(surface.get_width() - graph_w - 16, 8, graph_w + 8, graph_h + 24 + 14 * (len(self._stats) + len(self.counters) + 1))
+        shade = pygame.Surface(panel.size, pygame.SRCALPHA)
+        shade.fill((0, 0, 0, 170))
+        surface.blit(shade, panel.topleft)
+
+        # frame-time graph, one column per frame, budget line in yellow
+        gx, gy = panel.x + 4, panel.y + 4
+        scale = graph_h / (budget_ms * 2.0)
+        frames = self.frame_times()[-graph_w:]
+        for x, ft in enumerate(frames):
+            h = min(graph_h, int(ft * 1000.0 * scale))
+            color = (80, 220, 80) if ft * 1000.0 <= budget_ms else (230, 70, 70)
+            pygame.draw.line(surface, color, (gx + x, gy + graph_h), (gx + x, gy + graph_h - h))
+        by = gy + graph_h - int(budget_ms * scale)
+        pygame.draw.line(surface, (230, 200, 60), (gx, by), (gx + graph_w, by))
+
+        y = gy + graph_h + 6
+        head = self.font.render('phase        p50     p99 (ms)', True, (200, 200, 200))
+        surface.blit(head, (gx, y))
+        for name, (p50, p99) in self._stats.items():
+            y += 14
+            line = self.font.render(f'{name:<13}{p50:6.2f}  {p99:6.2f}', True, (230, 230, 230))
+            surface.blit(line, (gx, y))
+        for text in self.counters.values():
+            y += 14
+            surface.blit(self.font.render(text, True, (170, 210, 250)), (gx, y))
+
+
+class _NullPerf:
+    # stand-in used by scenes that run without a SceneManager (headless/tests)
+    enabled = False
+    overlay = False
+
+    def begin_frame(self):
+        pass
+
+    def lap(self, name):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+NULL_PERF = _NullPerf()
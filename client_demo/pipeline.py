@@ -0,0 +1,108 @@
+import threading
+import time
+
+from perf import FramePerf
+
+
+class RenderFrame:
+    """What GameScene.render draws for one tick, detached from the live scene.
+
+    Built from a WorldSnapshot (whose entity dicts are already copies) plus
+    a frozen copy of the particles, so it can be drawn on one thread while
+    another one simulates the next tick. The snapshot's scalar fields are
+    plain attributes under their scene names (hp, wave, _death_timer, ...).
+    """
+
+    def __init__(self, snap, fields, view, particles):
+        self.__dict__.update(zip(fields, snap.scalars))
+        self.now = snap.now
+        self.view = view
+        self.players = snap.players
+        self.enemies = snap.enemies
+        self.bullets = snap.bullets
+        self.enemy_bullets = snap.enemy_bullets
+        self.particles = particles
+
+
+class SimPipeline:
+    """Simulates tick N+1 on a worker thread while tick N is rendered.
+
+    Each frame the manager calls wait() first and handles events while the
+    worker is idle (so input, scene switches and debug keys never race the
+    simulation). step() then starts the next update and returns the frame
+    published by the previous one, which the main thread draws meanwhile.
+    The scene publishes frames through render_frame(); nothing the worker
+    touches afterwards is shared with them.
+
+    The worker has its own FramePerf, so the scene's sub-phase laps do not
+    interleave with the main thread's.
+    """
+
+    def __init__(self, perf_enabled=False):
+        self.perf = FramePerf(enabled=perf_enabled)
+        self.scene = None
+        self.frame = None
+        self.sim_ms = 0.0
+        self.wait_ms = 0.0
+        self._dt = 0.0
+        self._busy = False
+        self._error = None
+        self._go = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sim', daemon=True)
+        self._thread.start()
+
+    def on_worker(self):
+        return threading.current_thread() is self._thread
+
+    def _run(self):
+        go, done, perf = self._go, self._done, self.perf
+        while True:
+            go.wait()
+            go.clear()
+            start = time.perf_counter()
+            perf.begin_frame()
+            try:
+                self.scene.update(self._dt)
+                perf.lap('update')
+                self.frame = self.scene.render_frame()
+            except BaseException as exc:
+                self._error = exc
+            perf.end_frame()
+            self.sim_ms = (time.perf_counter() - start) * 1000.0
+            done.set()
+
+    def step(self, scene, dt):
+        # start simulating the next tick of `scene`; returns the newest
+        # published frame, which is what to draw in the meantime
+        self.wait()
+        if scene is not self.scene:
+            self.scene = scene
+            self.frame = scene.render_frame()
+        frame = self.frame
+        self._dt = dt
+        self._busy = True
+        self._done.clear()
+        self._go.set()
+        return frame
+
+    def wait(self):
+        # block until the running step (if any) has published its frame
+        if self._busy:
+            start = time.perf_counter()
+            self._done.wait()
+            self._busy = False
+            self.wait_ms = (time.perf_counter() - start) * 1000.0
+            if self._error is not None:
+                exc, self._error = self._error, None
+                raise exc
+        return self.frame
+
+    def detach(self):
+        # drop the scene (after a scene switch); the next step() starts fresh
+        self.wait()
+        self.scene = None
+        self.frame = None
+
+    def status(self):
+        return f'pipeline: sim {self.sim_ms:.1f}ms  waited {self.wait_ms:.1f}ms'
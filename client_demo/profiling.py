@@ -0,0 +1,141 @@
+import os
+import sys
+import time
+import cProfile
+import threading
+from collections import Counter
+
+
+class SamplingProfiler:
+    """Low-overhead stack sampler for a single thread.
+
+    A daemon thread grabs the target thread's frame every `interval` seconds
+    and counts collapsed stacks ("outer;inner;leaf"), the input format of
+    flamegraph.pl / speedscope.
+    """
+
+    def __init__(self, interval=0.005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            parts = []
+            while frame is not None:
+                code = frame.f_code
+                parts.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            parts.reverse()
+            self.stacks[';'.join(parts)] += 1
+            self.samples += 1
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+class ProfilerHooks:
+    """Start/stop a profiler around the current scene.
+
+    F5 toggles cProfile, Shift+F5 toggles the sampling profiler; a capture
+    started by hand is also written out when its scene exits, so every
+    file covers exactly one scene. Setting CLIENT_PROFILE=cprofile|sample
+    profiles every scene from enter to exit without any key press. Output
+    lands in CLIENT_PROFILE_DIR (default: profiles/ next to this module,
+    whatever the working directory) as
+    <scene>_w<wave>_<timestamp>.pstats / .collapsed.
+    """
+
+    MODES = ('cprofile', 'sample')
+
+    def __init__(self, out_dir=None, auto_mode=None):
+        self.out_dir = out_dir or os.environ.get('CLIENT_PROFILE_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+        mode = auto_mode if auto_mode is not None else os.environ.get('CLIENT_PROFILE', '')
+        self.auto_mode = mode.lower() if mode and mode.lower() in self.MODES else None
+        self.mode = None
+        self._profiler = None
+        self._scene_name = None
+        self._start_wave = None
+        self._started = 0.0
+
+    @property
+    def active(self):
+        return self._profiler is not None
+
+    def start(self, mode, scene_name, scene=None):
+        if self.active:
+            self.stop(scene)
+        self.mode = mode
+        self._scene_name = scene_name or 'scene'
+        self._start_wave = getattr(scene, 'wave', None)
+        self._started = time.time()
+        if mode == 'sample':
+            self._profiler = SamplingProfiler()
+            self._profiler.start()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self, scene=None):
+        # returns the written file path, or None when nothing was running
+        if not self.active:
+            return None
+        prof = self._profiler
+        self._profiler = None
+        if self.mode == 'sample':
+            prof.stop()
+        else:
+            prof.disable()
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, self._filename(scene))
+        if self.mode == 'sample':
+            prof.write(path)
+        else:
+            prof.dump_stats(path)
+        print(f'profile written to {path}')
+        return path
+
+    def toggle(self, mode, scene_name, scene=None):
+        if self.active:
+            return self.stop(scene)
+        self.start(mode, scene_name, scene)
+        return None
+
+    def _filename(self, scene):
+        waves = ''
+        end_wave = getattr(scene, 'wave', None)
+        if self._start_wave is not None:
+            waves = f'_w{self._start_wave}'
+            if end_wave is not None and end_wave != self._start_wave:
+                waves += f'-{end_wave}'
+        ext = 'collapsed' if self.mode == 'sample' else 'pstats'
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(self._started))
+        return f'{self._scene_name}{waves}_{stamp}.{ext}'
+
+    # --- SceneManager hooks ---
+    def scene_exited(self, scene):
+        # manual captures end with their scene as well
+        self.stop(scene)
+
+    def scene_entered(self, name, scene):
+        if self.auto_mode:
+            self.start(self.auto_mode, name, scene)
@@ -0,0 +1,99 @@
+# degradation steps, cheapest last; every step only changes what is drawn,
+# never what is simulated
+#   labels          draw name / HP / ult bars only within this many pixels of
+#                   the view centre (None: everywhere, 0: nowhere)
+#   particle_scale  multiplier on particles per burst
+#   particle_cap    most particles drawn per frame (None: all)
+#   bullet_cap      most enemy bullets drawn per frame (None: all)
+#   render_every    draw one frame in N; the simulation still runs every frame
+LEVELS = (
+    {'name': 'full', 'labels': None, 'particle_scale': 1.0, 'particle_cap': None, 'bullet_cap': None, 'render_every': 1},
+    {'name': 'reduced', 'labels': 320, 'particle_scale': 0.5, 'particle_cap': 1024, 'bullet_cap': None, 'render_every': 1},
+    {'name': 'low', 'labels': 160, 'particle_scale': 0.25, 'particle_cap': 256, 'bullet_cap': 200, 'render_every': 1},
+    {'name': 'minimal', 'labels': 0, 'particle_scale': 0.25, 'particle_cap': 128, 'bullet_cap': 120, 'render_every': 2},
+)
+FULL = LEVELS[0]
+
+
+class QualityGovernor:
+    """Steps quality down when frames overrun the budget and back up when
+    there is room again.
+
+    frame(work_ms) takes the time a frame spent working (not sleeping in
+    clock.tick) and keeps an exponential average. Degrading needs the
+    average over budget for `degrade_after` frames in a row; restoring
+    needs it under `low` x budget for `restore_after` frames. A restore
+    that is undone again within `restore_after` frames doubles the wait
+    before the next restore (up to `max_backoff` x), so a machine that sits
+    on the edge does not flip between two levels.
+
+    mode is 'auto', 'off' (always full quality) or a level name / index to
+    pin, as given by CLIENT_QUALITY; names are matched case-insensitively
+    and anything unrecognised falls back to 'auto' with a warning.
+    """
+
+    def __init__(self, budget_ms, levels=LEVELS, mode='auto', smoothing=0.1, low=0.6,
+                 degrade_after=30, restore_after=180, max_backoff=8):
+        self.budget_ms = budget_ms
+        self.levels = levels
+        self.smoothing = smoothing
+        self.low = low
+        self.degrade_after = degrade_after
+        self.restore_after = restore_after
+        self.max_backoff = max_backoff
+        self.level = 0
+        key = (mode or '').strip().lower()
+        self.auto = key in ('', 'auto')
+        if not self.auto and key != 'off':
+            names = [lv['name'] for lv in levels]
+            if key in names:
+                self.level = names.index(key)
+            else:
+                try:
+                    self.level = max(0, min(len(levels) - 1, int(key)))
+                except ValueError:
+                    # a typo in the environment must not keep the client from starting
+                    print(f"quality mode {mode!r} is not auto, off, a level name ({', '.join(names)}) or an index; using auto")
+                    self.auto = True
+        self.ema = 0.0
+        self.backoff = 1
+        self.changes = 0
+        self._over = 0
+        self._under = 0
+        self._since_restore = None
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    def set_level(self, level):
+        self.level = max(0, min(len(self.levels) - 1, level))
+        self._over = self._under = 0
+        self.changes += 1
+
+    def frame(self, work_ms):
+        if not self.auto:
+            return
+        self.ema += (work_ms - self.ema) * self.smoothing
+        if self._since_restore is not None:
+            self._since_restore += 1
+        if self.ema > self.budget_ms:
+            self._under = 0
+            self._over += 1
+            if self._over >= self.degrade_after and self.level < len(self.levels) - 1:
+                if self._since_restore is not None and self._since_restore < self.restore_after:
+                    self.backoff = min(self.max_backoff, self.backoff * 2)
+                self._since_restore = None
+                self.set_level(self.level + 1)
+        elif self.ema < self.budget_ms * self.low:
+            self._over = 0
+            self._under += 1
+            if self._under >= self.restore_after * self.backoff and self.level > 0:
+                self.set_level(self.level - 1)
+                self._since_restore = 0
+        else:
+            self._over = self._under = 0
+
+    def status(self):
+        mode = 'auto' if self.auto else 'fixed'
+        return f'quality: {self.settings["name"]} ({self.level}/{len(self.levels) - 1} {mode})  work {self.ema:.1f}/{self.budget_ms:.1f}ms  backoff x{self.backoff}'
@@ -0,0 +1,172 @@
+from collections import Counter, OrderedDict, deque
+import pygame
+
+
+_texts = OrderedDict()
+
+
+def text_surface(font, text, color=(255, 255, 255), limit=256):
+    # rendered text shared by every backend; labels that repeat frame after
+    # frame (player names, BOSS, static HUD lines) are rasterized once
+    key = (id(font), text, color)
+    surf = _texts.get(key)
+    if surf is None:
+        surf = _texts[key] = font.render(text, True, color)
+        if len(_texts) > limit:
+            _texts.popitem(last=False)
+    else:
+        _texts.move_to_end(key)
+    return surf
+
+
+class RenderBackend:
+    """The handful of drawing calls scenes make: fill, circle, rect, text
+    and blit(s). Scenes draw through a backend instead of calling
+    pygame.draw on a Surface, so the target can be swapped for one that
+    draws nothing (to time simulation on its own) or one that records
+    what would have been drawn.
+    """
+
+    def get_size(self):
+        raise NotImplementedError
+
+    def fill(self, color, rect=None):
+        pass
+
+    def circle(self, color, center, radius, width=0):
+        pass
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        pass
+
+    def text(self, font, text, pos, color=(255, 255, 255), center=False):
+        pass
+
+    def blit(self, source, dest):
+        pass
+
+    def blits(self, seq, doreturn=False):
+        pass
+
+
+class PygameBackend(RenderBackend):
+    # draws into a pygame Surface exactly as the scenes used to
+    def __init__(self, surface):
+        self.surface = surface
+
+    def get_size(self):
+        return self.surface.get_size()
+
+    def fill(self, color, rect=None):
+        self.surface.fill(color, rect)
+
+    def circle(self, color, center, radius, width=0):
+        pygame.draw.circle(self.surface, color, center, radius, width)
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        pygame.draw.rect(self.surface, color, rect, width, border_radius=border_radius)
+
+    def text(self, font, text, pos, color=(255, 255, 255), center=False):
+        surf = text_surface(font, text, color)
+        r = surf.get_rect()
+        if center:
+            r.center = pos
+        else:
+            r.topleft = pos
+        self.surface.blit(surf, r)
+
+    def blit(self, source, dest):
+        self.surface.blit(source, dest)
+
+    def blits(self, seq, doreturn=False):
+        self.surface.blits(seq, doreturn)
+
+
+class NullBackend(RenderBackend):
+    # accepts every call and draws nothing
+    def __init__(self, size=(800, 600)):
+        self.size = tuple(size)
+
+    def get_size(self):
+        return self.size
+
+
+class RecordingBackend(RenderBackend):
+    """Records every draw call as an (op, args) tuple, optionally passing it
+    on to an inner backend.
+
+    begin_frame() closes the current frame: its per-op call counts move to
+    `history` (one Counter per frame, newest last) and the command list
+    starts over. blits() counts as one call; `items` counts what it drew.
+    """
+
+    def __init__(self, inner=None, size=(800, 600), keep=240):
+        self.inner = inner
+        self.size = tuple(size)
+        self.commands = []
+        self.counts = Counter()
+        self.history = deque(maxlen=keep)
+        self.frames = 0
+
+    def get_size(self):
+        return self.inner.get_size() if self.inner is not None else self.size
+
+    def begin_frame(self):
+        if self.commands or self.counts:
+            self.history.append(self.counts)
+            self.frames += 1
+        self.commands = []
+        self.counts = Counter()
+
+    def _record(self, op, args):
+        self.commands.append((op, args))
+        self.counts[op] += 1
+
+    def calls(self):
+        # draw calls so far this frame, blits batches counted once
+        return sum(n for op, n in self.counts.items() if op != 'items')
+
+    def max_calls(self, op=None):
+        # worst frame in history, for asserting draw-call budgets
+        if op is None:
+            return max((sum(n for k, n in c.items() if k != 'items') for c in self.history), default=0)
+        return max((c[op] for c in self.history), default=0)
+
+    def fill(self, color, rect=None):
+        self._record('fill', (color, rect))
+        if self.inner is not None:
+            self.inner.fill(color, rect)
+
+    def circle(self, color, center, radius, width=0):
+        self._record('circle', (color, center, radius, width))
+        if self.inner is not None:
+            self.inner.circle(color, center, radius, width)
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        self._record('rect', (color, rect, width, border_radius))
+        if self.inner is not None:
+            self.inner.rect(color, rect, width, border_radius)
+
+    def text(self, font, text, pos, color=(255, 255, 255), center=False):
+        self._record('text', (text, pos, color, center))
+        if self.inner is not None:
+            self.inner.text(font, text, pos, color, center)
+
+    def blit(self, source, dest):
+        self._record('blit', (source.get_size(), dest))
+        if self.inner is not None:
+            self.inner.blit(source, dest)
+
+    def blits(self, seq, doreturn=False):
+        seq = list(seq)
+        self._record('blits', (len(seq),))
+        self.counts['items'] += len(seq)
+        if self.inner is not None:
+            self.inner.blits(seq, doreturn)
+
+
+def as_backend(target):
+    # scenes accept either a backend or a plain Surface
+    if isinstance(target, RenderBackend):
+        return target
+    return PygameBackend(target)
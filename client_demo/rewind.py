@@ -0,0 +1,112 @@
+class WorldSnapshot:
+    """Everything GameScene.restore() needs to put the simulation back
+    exactly where GameScene.snapshot() found it.
+
+    Entities are stored as flat copies (position and velocity lists copied,
+    everything else shared because it is never mutated in place); references
+    between them are stored as list indices. Timers are not stored at all:
+    every pending callback is implied by a deadline field and is rebuilt
+    on restore.
+    """
+
+    __slots__ = ('now', 'scalars', 'state', 'map_id', 'camera', 'active', 'players', 'player_index',
+                 'player', 'moves', 'bleeding', 'enemies', 'bullets', 'enemy_bullets', 'spawner', 'rng')
+
+    def __init__(self, now, scalars, state, map_id, camera, active, players, player_index,
+                 player, moves, bleeding, enemies, bullets, enemy_bullets, spawner, rng=None):
+        self.now = now
+        self.scalars = scalars
+        self.state = state
+        self.map_id = map_id
+        self.camera = camera
+        self.active = active
+        self.players = players
+        self.player_index = player_index
+        self.player = player
+        self.moves = moves
+        self.bleeding = bleeding
+        self.enemies = enemies
+        self.bullets = bullets
+        self.enemy_bullets = enemy_bullets
+        self.spawner = spawner
+        self.rng = rng
+
+
+def copy_entity(ent):
+    c = ent.copy()
+    c['pos'] = c['pos'][:]
+    vel = c.get('vel')
+    if vel is not None:
+        c['vel'] = vel[:]
+    return c
+
+
+class RewindBuffer:
+    """Ring of the most recent snapshots, oldest overwritten first.
+
+    push(snap) stores one snapshot (normally one per simulation tick);
+    at(t) finds the newest snapshot taken at or before sim time t, and
+    truncate(t) forgets everything after t once the world has been
+    rewound there, so recording continues on the new timeline.
+    Nothing is recorded while enabled is False (the default).
+    """
+
+    def __init__(self, seconds=5.0, rate=60, enabled=False):
+        self.capacity = max(1, int(seconds * rate))
+        # off unless asked for: a snapshot per tick is not free under load
+        self.enabled = enabled
+        self._snaps = [None] * self.capacity
+        self.index = 0      # next slot to write
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self._snaps = [None] * self.capacity
+        self.index = 0
+        self.count = 0
+
+    def push(self, snap):
+        self._snaps[self.index] = snap
+        self.index = (self.index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def _slot(self, age):
+        # age 0 is the newest snapshot
+        return (self.index - 1 - age) % self.capacity
+
+    def latest(self):
+        return self._snaps[self._slot(0)] if self.count else None
+
+    def oldest(self):
+        return self._snaps[self._slot(self.count - 1)] if self.count else None
+
+    def at(self, t):
+        # snapshots are pushed in time order, so binary search by age
+        if not self.count:
+            return None
+        lo, hi = 0, self.count - 1
+        if self._snaps[self._slot(hi)].now > t:
+            return None
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._snaps[self._slot(mid)].now <= t:
+                hi = mid
+            else:
+                lo = mid + 1
+        return self._snaps[self._slot(lo)]
+
+    def truncate(self, t):
+        # drop snapshots newer than t
+        while self.count and self._snaps[self._slot(0)].now > t:
+            self.index = self._slot(0)
+            self._snaps[self.index] = None
+            self.count -= 1
+
+    def span(self):
+        # seconds of history currently held
+        if self.count < 2:
+            return 0.0
+        return self.latest().now - self.oldest().now
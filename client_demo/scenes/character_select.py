@@ -1,4 +1,6 @@
 import pygame
+from assets import bundle
+from display import mouse_pos
 from .scene import BaseScene
 
 
@@ -21,6 +23,9 @@ class CharacterSelectScene(BaseScene):
             for idx, (label, cid) in enumerate(self.characters):
                 rect = pygame.Rect(250, 180 + idx * 64, 300, 52)
                 if rect.collidepoint((mx, my)):
+                    # start decoding this character's assets while the map is chosen
+                    if self.manager and hasattr(self.manager, 'assets'):
+                        self.manager.assets.preload(bundle(character=cid))
                     # selected a character
                     if self.mode == 1:
                         if self.manager:
@@ -53,7 +58,7 @@ class CharacterSelectScene(BaseScene):
     def render(self, surface):
         surface.fill((28, 18, 24))
         self.draw_text(surface, 'Select Your Character', (400, 80), center=True)
-        mx, my = pygame.mouse.get_pos()
+        mx, my = mouse_pos()
         for idx, (label, _) in enumerate(self.characters):
             rect = pygame.Rect(250, 180 + idx * 64, 300, 52)
             self.draw_button(surface, rect, label, (mx, my))
@@ -1,4 +1,5 @@
 import pygame
+from render_backend import as_backend
 from .scene import BaseScene
 
 
@@ -27,10 +28,10 @@ class LoginScene(BaseScene):
                 self.input_active = False
 
     def render(self, surface):
-        surface.fill((20, 24, 32))
-        self.draw_text(surface, 'Login', (400, 120), center=True)
+        gfx = as_backend(surface)
+        gfx.fill((20, 24, 32))
+        self.draw_text(gfx, 'Login', (400, 120), center=True)
         # input box
-        pygame.draw.rect(surface, (255, 255, 255), self.input_rect, 2)
-        txt = self.font.render(self.username or 'Enter username (or press Enter for guest)', True, (220, 220, 220))
-        surface.blit(txt, (self.input_rect.x + 8, self.input_rect.y + 8))
-        self.draw_text(surface, 'Press Enter to continue', (400, 340), center=True)
+        gfx.rect((255, 255, 255), self.input_rect, 2)
+        gfx.text(self.font, self.username or 'Enter username (or press Enter for guest)', (self.input_rect.x + 8, self.input_rect.y + 8), (220, 220, 220))
+        self.draw_text(gfx, 'Press Enter to continue', (400, 340), center=True)
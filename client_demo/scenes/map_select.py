@@ -1,4 +1,6 @@
 import pygame
+from assets import bundle
+from display import mouse_pos
 from .scene import BaseScene
 
 
@@ -11,6 +13,9 @@ class MapSelectScene(BaseScene):
             ('Castle', 'castle'),
         ]
         self.selected_character = None
+        # map whose assets are being preloaded (the one under the mouse)
+        self._preload_map = None
+        self._preload_keys = []
 
     def on_enter(self, **kwargs):
         # accept character selection passed from previous scene
@@ -20,8 +25,26 @@ class MapSelectScene(BaseScene):
         # keep username forwarded from previous scenes
         self.username = kwargs.get('username', 'Player')
         self.players = kwargs.get('players')
+        self._preload_map = None
+        self._preload_keys = []
+
+    def _preload(self, mid):
+        assets = getattr(self.manager, 'assets', None)
+        if assets is None or mid == self._preload_map:
+            return
+        self._preload_map = mid
+        characters = [p.get('character') for p in self.players] if self.players else [self.selected_character]
+        keys = bundle(map_id=mid)
+        for cid in characters:
+            keys += bundle(character=cid)
+        self._preload_keys = assets.preload(keys)
 
     def handle_event(self, event):
+        if event.type == pygame.MOUSEMOTION:
+            # hovering a map counts as a selection: start decoding it now
+            for idx, (label, mid) in enumerate(self.maps):
+                if pygame.Rect(200, 160 + idx * 64, 400, 52).collidepoint(event.pos):
+                    self._preload(mid)
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             mx, my = event.pos
             for idx, (label, mid) in enumerate(self.maps):
@@ -44,8 +67,14 @@ class MapSelectScene(BaseScene):
         surface.fill((12, 24, 36))
         self.draw_text(surface, 'Select Map', (400, 60), center=True)
         self.draw_text(surface, f'Character: {getattr(self, "selected_character_label", "?")}', (400, 100), center=True)
-        mx, my = pygame.mouse.get_pos()
+        mx, my = mouse_pos()
         for idx, (label, _) in enumerate(self.maps):
             rect = pygame.Rect(200, 160 + idx * 64, 400, 52)
             self.draw_button(surface, rect, label, (mx, my))
+        assets = getattr(self.manager, 'assets', None)
+        if assets is not None and self._preload_keys:
+            done = assets.progress(self._preload_keys)
+            name = next((lbl for lbl, mid in self.maps if mid == self._preload_map), self._preload_map)
+            status = 'ready' if done >= 1.0 else f'{int(done * 100)}%'
+            self.draw_text(surface, f'Loading {name}: {status}', (400, 480), center=True)
         self.draw_text(surface, 'Esc: Back to Character Select', (400, 520), center=True)
@@ -1,4 +1,5 @@
 import pygame
+from display import mouse_pos
 from .scene import BaseScene
 
 
@@ -10,6 +11,7 @@ class MenuScene(BaseScene):
             ('Start 2P', 'start2'),
             ('Continue', 'continue'),
             ('View Saves', 'saves'),
+            ('Stress Test', 'stress'),
             ('Exit', 'exit'),
         ]
 
@@ -39,13 +41,15 @@ class MenuScene(BaseScene):
                             self.manager.goto('game', new=True)
                     elif name == 'saves':
                         self.manager.goto('saves')
+                    elif name == 'stress':
+                        self.manager.goto('stress', username=getattr(self, 'username', 'Guest'))
                     elif name == 'exit':
                         pygame.event.post(pygame.event.Event(pygame.QUIT))
 
     def render(self, surface):
         surface.fill((18, 18, 40))
         self.draw_text(surface, f'Welcome, {getattr(self, "username", "Guest")}', (400, 120), center=True)
-        mx, my = pygame.mouse.get_pos()
+        mx, my = mouse_pos()
         for idx, (label, _) in enumerate(self.buttons):
             rect = pygame.Rect(300, 200 + idx * 60, 200, 44)
             self.draw_button(surface, rect, label, (mx, my))
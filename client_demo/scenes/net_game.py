@@ -0,0 +1,165 @@
+import json
+import socket
+import threading
+import pygame
+import net
+from snapshot import SnapshotDecoder
+from .game import GameScene
+
+
+# key -> input button; both control schemes drive the local player
+KEY_BUTTONS = {
+    pygame.K_a: net.LEFT, pygame.K_LEFT: net.LEFT,
+    pygame.K_d: net.RIGHT, pygame.K_RIGHT: net.RIGHT,
+    pygame.K_w: net.UP, pygame.K_UP: net.UP,
+    pygame.K_s: net.DOWN, pygame.K_DOWN: net.DOWN,
+    pygame.K_SPACE: net.FIRE, pygame.K_RETURN: net.FIRE,
+    pygame.K_r: net.ULT, pygame.K_RCTRL: net.ULT,
+}
+
+
+class NetGameScene(GameScene):
+    """Thin client for server.py: sends inputs, renders the received state.
+
+    Nothing is simulated locally. The socket thread decodes snapshot deltas
+    into the decoder's entity dicts and acknowledges them; update() points
+    the scene lists at those dicts and GameScene.render draws them. With
+    spectate=True no player slot is taken and inputs are not sent.
+    """
+
+    # update() only swaps in decoded state; nothing to overlap with rendering
+    pipelined = False
+
+    def __init__(self, screen, save_mgr):
+        super().__init__(screen, save_mgr)
+        self.sock = None
+        self.buttons = 0
+        self.seq = 0
+        self.local_player = None
+        self.status = 'Connecting...'
+        self.decoder = None
+        self.spectate = False
+        self._fresh = False
+        self._lock = threading.Lock()
+        # inputs (main thread) and acks (socket thread) share one stream;
+        # whole frames go out one at a time
+        self._send_lock = threading.Lock()
+        self._reader = None
+        self._death_timer = None
+        self.hp = self.max_hp = 0
+        self.wave = 1
+
+    def on_enter(self, **kwargs):
+        self.host = kwargs.get('host', '127.0.0.1')
+        self.port = int(kwargs.get('port', 7777))
+        self.player_name = kwargs.get('username', 'Player')
+        self.character = kwargs.get('character')
+        self.spectate = bool(kwargs.get('spectate'))
+        self.decoder = SnapshotDecoder()
+        self.local_player = None
+        self.players = []
+        self.enemies = []
+        self.bullets = []
+        self.enemy_bullets = []
+        self.running = False
+        try:
+            self.sock = socket.create_connection((self.host, self.port), timeout=5.0)
+            self.sock.settimeout(None)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError as exc:
+            self.sock = None
+            self.status = f'Could not connect to {self.host}:{self.port} ({exc})'
+            return
+        self.status = 'Waiting for server...'
+        self._send(net.json_frame(net.JOIN, {'name': self.player_name, 'character': self.character, 'spectate': self.spectate}))
+        self._reader = threading.Thread(target=self._recv_loop, name='net-recv', daemon=True)
+        self._reader.start()
+
+    def on_exit(self):
+        sock = self.sock
+        if sock:
+            self._send(net.frame(net.BYE))
+            with self._send_lock:
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+        self.sock = None
+
+    def _send(self, data):
+        # called from both threads; the other one may drop the socket meanwhile
+        sock = self.sock
+        if not sock:
+            return
+        with self._send_lock:
+            try:
+                sock.sendall(data)
+            except OSError:
+                self.status = 'Connection lost'
+                if self.sock is sock:
+                    self.sock = None
+
+    def _recv_loop(self):
+        buf = net.FrameBuffer()
+        sock = self.sock
+        try:
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                for kind, payload in buf.feed(data):
+                    if kind == net.STATE:
+                        with self._lock:
+                            seq = self.decoder.decode(payload)
+                            self._fresh = self._fresh or seq is not None
+                        if seq is not None:
+                            self._send(net.ack_frame(seq))
+                    elif kind == net.WELCOME:
+                        self.local_player = json.loads(payload.decode('utf-8'))['player']
+                    elif kind == net.FULL:
+                        self.status = 'Server is full'
+        except (OSError, ValueError):
+            pass
+        self.status = 'Disconnected from server'
+        self.running = False
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.manager.goto('menu')
+            return
+        buttons = self.buttons
+        if event.type == pygame.KEYDOWN and event.key in KEY_BUTTONS:
+            buttons |= KEY_BUTTONS[event.key]
+        elif event.type == pygame.KEYUP and event.key in KEY_BUTTONS:
+            buttons &= ~KEY_BUTTONS[event.key]
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            buttons |= net.FIRE
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            buttons &= ~net.FIRE
+        if buttons != self.buttons and not self.spectate:
+            self.buttons = buttons
+            self.seq += 1
+            self._send(net.input_frame(self.seq, buttons))
+
+    def update(self, dt):
+        with self._lock:
+            if not self._fresh:
+                return
+            self._fresh = False
+            dead = self.decoder.apply_to(self)
+        self._death_timer = 1.0 if dead else None
+        idx = self.local_player
+        if idx is not None and 0 <= idx < len(self.players):
+            self.player = self.players[idx]
+            self.hp = self.player['hp']
+            self.max_hp = self.player['max_hp']
+
+    def render(self, surface):
+        if not self.players:
+            surface.fill((30, 30, 40))
+            self.draw_text(surface, self.status, (400, 240), center=True)
+            self.draw_text(surface, 'Esc: Back to Menu', (400, 520), center=True)
+            return
+        super().render(surface)
+        mode = 'Spectating' if self.spectate else 'Online'
+        self.draw_text(surface, f'{mode}: {self.host}:{self.port}', (14, 48), color=(180, 220, 255))
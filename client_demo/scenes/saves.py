@@ -1,4 +1,5 @@
 import pygame
+from display import mouse_pos
 from .scene import BaseScene
 
 
@@ -87,7 +88,7 @@ class SavesScene(BaseScene):
     def render(self, surface):
         surface.fill((40, 20, 20))
         self.draw_text(surface, 'Saves', (400, 48), center=True)
-        mx, my = pygame.mouse.get_pos()
+        mx, my = mouse_pos()
         if not self.items:
             self.draw_text(surface, 'No saves found', (400, 300), center=True)
             return
@@ -1,7 +1,14 @@
 import pygame
+from perf import NULL_PERF
+from quality import FULL
+from ui import button_face
+from render_backend import as_backend
 
 
 class BaseScene:
+    # menus are idle windows for the GC policy; GameScene overrides this
+    gc_idle = True
+
     def __init__(self, screen, save_mgr):
         self.screen = screen
         self.save_mgr = save_mgr
@@ -9,6 +16,21 @@ class BaseScene:
         self.font = pygame.font.SysFont(None, 28)
         self.modal = None
 
+    @property
+    def perf(self):
+        # frame timers of the owning manager (no-op when running headless);
+        # the pipeline's simulation thread has timers of its own
+        pipeline = getattr(self.manager, 'pipeline', None)
+        if pipeline is not None and pipeline.on_worker():
+            return pipeline.perf
+        return getattr(self.manager, 'perf', None) or NULL_PERF
+
+    @property
+    def quality(self):
+        # current quality settings of the owning manager (full when headless)
+        gov = getattr(self.manager, 'quality', None)
+        return gov.settings if gov is not None else FULL
+
     def on_enter(self, **kwargs):
         pass
 
@@ -29,26 +51,14 @@ class BaseScene:
         # if a modal is active, the scene should render underneath and modal will be drawn by manager/scene
 
     def draw_text(self, surface, text, pos, color=(255, 255, 255), center=False):
-        surf = self.font.render(text, True, color)
-        rect = surf.get_rect()
-        if center:
-            rect.center = pos
-        else:
-            rect.topleft = pos
-        surface.blit(surf, rect)
+        # surface may be a pygame Surface or a render backend
+        as_backend(surface).text(self.font, text, pos, color, center)
 
     def draw_button(self, surface, rect, text, mouse_pos):
-        # nicer button with subtle shadow and hover
-        color = (70, 70, 70)
-        hover = rect.collidepoint(mouse_pos)
-        if hover:
-            color = (120, 120, 120)
-        # shadow
-        shadow = rect.move(3, 3)
-        pygame.draw.rect(surface, (20, 20, 20), shadow, border_radius=6)
-        pygame.draw.rect(surface, color, rect, border_radius=6)
-        pygame.draw.rect(surface, (200, 200, 200), rect, 2, border_radius=6)
-        self.draw_text(surface, text, rect.center, center=True)
+        # nicer button with subtle shadow and hover; the composed face is
+        # cached per (size, text, hover) so menus only blit each frame
+        color = (120, 120, 120) if rect.collidepoint(mouse_pos) else (70, 70, 70)
+        surface.blit(button_face(rect.size, text, self.font, color, (255, 255, 255)), rect.topleft)
 
     def show_confirm(self, title, message, yes_label='Yes', no_label='No'):
         from ui import ConfirmDialog
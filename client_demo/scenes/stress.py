@@ -0,0 +1,212 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import platform
+import pygame
+from .game import GameScene
+
+
+# damage is off so the run never ends, but every hit test still runs
+STRESS_TUNING = {
+    'enemy_bullet_damage_min': 0,
+    'enemy_bullet_damage_max': 0,
+    'boss_bullet_damage': 0,
+    'contact_damage': 0,
+}
+
+
+class StressScene(GameScene):
+    """Endless capacity test: GameScene with the load ramped every few seconds.
+
+    Each level raises the enemy count (topped up through the spawner
+    queue), shortens the enemy fire interval, adds a boss and makes the
+    bosses summon more often and in bigger groups, well past anything a
+    normal wave reaches. The HUD shows entity counts, simulation ticks per
+    second and frame time. The first time the frame time stays over the
+    budget, the entity counts are appended to perf_logs/stress.jsonl
+    together with the machine and build details; leaving without ever
+    going over logs the peak instead. Quality is pinned to full while the
+    test runs and the rewind history is off, so that runs on different
+    machines and builds compare (the log records both settings).
+    """
+
+    def __init__(self, screen, save_mgr, step_seconds=3.0, base_enemies=50, growth=1.35, max_enemies=20000, over_frames=30):
+        super().__init__(screen, save_mgr)
+        self.step_seconds = step_seconds
+        self.base_enemies = base_enemies
+        self.growth = growth
+        self.max_enemies = max_enemies
+        self.over_frames = over_frames
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.level = 0
+        self.target = self.base_enemies
+        self.elapsed = 0.0
+        self.tps = 0.0
+        self.frame_ms = 0.0
+        self.peak = 0
+        self.exceeded = None
+        self._over = 0
+        self._ticks = 0
+        self._tps_start = time.perf_counter()
+        self._quality_state = None
+
+    def on_enter(self, **kwargs):
+        if 'seed' in kwargs:
+            # reproducible load for comparing builds
+            random.seed(kwargs['seed'])
+        tuning = dict(STRESS_TUNING)
+        tuning.update(kwargs.get('tuning') or {})
+        kwargs.update(new=True, map=None, wave=1, tuning=tuning)
+        super().on_enter(**kwargs)
+        self._reset_stats()
+        # a world copy per tick would be measured instead of the game
+        # (server.py and batch_sim.py turn it off too)
+        self.history.enabled = False
+        # thousands of queued enemies must not trickle in at 4 per frame
+        self.spawner.per_frame = 256
+        gov = getattr(self.manager, 'quality', None)
+        if gov is not None:
+            self._quality_state = (gov.auto, gov.level)
+            gov.auto = False
+            gov.set_level(0)
+        self._apply_level()
+
+    def on_exit(self):
+        if self.exceeded is None and self.peak:
+            self._log(False)
+        gov = getattr(self.manager, 'quality', None)
+        if gov is not None and self._quality_state is not None:
+            gov.auto, level = self._quality_state
+            gov.set_level(level)
+        self.spawner.per_frame = 4
+
+    # --- load ramp ---
+    def _apply_level(self):
+        lv = self.level
+        t = self.tuning
+        self.target = min(self.max_enemies, int(self.base_enemies * self.growth ** lv))
+        t['enemy_fire_min'] = max(0.2, 1.0 * 0.85 ** lv)
+        t['enemy_fire_max'] = max(0.4, 3.0 * 0.85 ** lv)
+        t['boss_summon_every'] = max(2.0, 20.0 - 2.0 * lv)
+        t['boss_summon_count'] = 5 + lv
+        # one more boss every other level, starting with the first
+        bosses = sum(1 for e in self.enemies if e.get('is_boss')) + sum(1 for e in self.spawner.pending if e.get('is_boss'))
+        if bosses < lv // 2 + 1:
+            self.spawner.queue(self._make_boss())
+
+    def _make_boss(self):
+        view = self.camera.rect
+        return {
+            'pos': [random.uniform(view.left + 80, view.right - 80), random.uniform(view.top + 80, view.bottom - 80)],
+            'vel': [random.uniform(-40.0, 40.0), random.uniform(-40.0, 40.0)],
+            'speed': 0.0,
+            'is_boss': True,
+            # never dies, so the boss-slain pause never interrupts the run
+            'hp': 10 ** 9,
+            'max_hp': 10 ** 9,
+            'phase': 1,
+            'fire_at': 0.5,
+            'summon_at': 1.0,
+            'special_at': 3.0,
+        }
+
+    def _top_up(self):
+        # queue enough regular enemies to reach the target count
+        missing = self.target - len(self.enemies) - len(self.spawner.pending)
+        if missing <= 0:
+            return
+        view = self.camera.rect
+        t = self.tuning
+        uniform = random.uniform
+        for _ in range(min(missing, 512)):
+            ang = uniform(0, math.tau)
+            self.spawner.queue({
+                'pos': [uniform(view.left + 20, view.right - 20), uniform(view.top + 20, view.bottom - 20)],
+                'vel': [math.cos(ang) * 30.0, math.sin(ang) * 30.0],
+                'speed': uniform(24, 48),
+                'fire_at': uniform(t['enemy_fire_min'], t['enemy_fire_max']),
+                'hp': 3,
+            })
+
+    def update(self, dt):
+        if not self.running:
+            return super().update(dt)
+        self.elapsed += dt
+        if self.elapsed >= (self.level + 1) * self.step_seconds:
+            self.level += 1
+            self._apply_level()
+        self._top_up()
+        # invulnerable: bleed is the only damage left and it is healed every tick
+        for p in self.players:
+            p['hp'] = p.get('max_hp', 100)
+        self.hp = self.player.get('hp', self.max_hp)
+        super().update(dt)
+        self._measure()
+
+    def _measure(self):
+        self._ticks += 1
+        now = time.perf_counter()
+        if now - self._tps_start >= 1.0:
+            self.tps = self._ticks / (now - self._tps_start)
+            self._ticks = 0
+            self._tps_start = now
+        total = self.total_entities()
+        self.peak = max(self.peak, total)
+        manager = self.manager
+        if manager is None:
+            return
+        self.frame_ms = getattr(manager, 'work_ms', 0.0)
+        budget = 1000.0 / getattr(manager, 'fps', 60)
+        self._over = self._over + 1 if self.frame_ms > budget else 0
+        if self._over >= self.over_frames and self.exceeded is None:
+            self.exceeded = total
+            self._log(True)
+
+    def total_entities(self):
+        return len(self.enemies) + len(self.bullets) + len(self.enemy_bullets) + self.particles.count
+
+    def _log(self, exceeded):
+        record = {
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'exceeded': exceeded,
+            'entities': self.exceeded if exceeded else self.peak,
+            'counts': self.entity_counts(),
+            'level': self.level,
+            'elapsed': round(self.elapsed, 2),
+            'frame_ms': round(self.frame_ms, 2),
+            'budget_ms': round(1000.0 / getattr(self.manager, 'fps', 60), 2),
+            'tps': round(self.tps, 1),
+            'resolution': list(self.screen.get_size()),
+            'pipeline': getattr(self.manager, 'pipeline', None) is not None,
+            'rewind_history': self.history.enabled,
+            'platform': platform.platform(),
+            'cpu': platform.processor() or platform.machine(),
+            'python': sys.version.split()[0],
+            'pygame': pygame.version.ver,
+        }
+        log_dir = getattr(self.manager, 'perf_dir', None) or 'perf_logs'
+        os.makedirs(log_dir, exist_ok=True)
+        path = os.path.join(log_dir, 'stress.jsonl')
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+        if exceeded:
+            print(f'stress: frame budget exceeded at {record["entities"]} entities (level {self.level}), logged to {path}')
+        else:
+            print(f'stress: budget never exceeded, peak {record["entities"]} entities, logged to {path}')
+
+    def render(self, surface, frame=None):
+        super().render(surface, frame)
+        counts = self.entity_counts()
+        lines = (
+            f'STRESS  level {self.level}  target {self.target}  {self.elapsed:.0f}s',
+            f'enemies {counts["enemies"]}  queued {counts["pending_spawns"]}  bullets {counts["bullets"]}  enemy bullets {counts["enemy_bullets"]}  particles {counts["particles"]}',
+            f'entities {self.total_entities()}  tps {self.tps:.0f}  frame {self.frame_ms:.1f}ms',
+            f'budget first exceeded at {self.exceeded} entities' if self.exceeded is not None else 'budget not exceeded yet',
+        )
+        for i, text in enumerate(lines):
+            self.draw_text(surface, text, (14, 52 + i * 20), color=(255, 220, 120))
@@ -0,0 +1,355 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from collections import deque
+
+# the simulation is headless: no window, no audio
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pygame
+
+import net
+from snapshot import SnapshotEncoder, SnapshotDecoder
+from scenes.game import GameScene
+
+
+class ClientConn:
+    def __init__(self, cid, writer):
+        self.cid = cid
+        self.writer = writer
+        self.player = None
+        self.name = f'client{cid}'
+        self.character = None
+        self.spectator = False
+        # last snapshot the client acknowledged; deltas are encoded against it
+        self.acked = 0
+        # inputs received since the last tick, applied in arrival order
+        self.inputs = deque(maxlen=64)
+        self.buttons = 0
+        self.last_seq = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.connected_at = time.perf_counter()
+
+    def send(self, data):
+        self.bytes_out += len(data)
+        self.writer.write(data)
+
+
+class GameServer:
+    """Authoritative GameScene simulation served over TCP.
+
+    Clients JOIN, then stream INPUT frames (button bitmask). Every tick the
+    server drains each client's input queue into its player, advances the
+    scene by a fixed dt and broadcasts the world state.
+    """
+
+    def __init__(self, host='127.0.0.1', port=7777, tick_rate=30, max_players=30, min_players=1, report_every=5.0):
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_players = max_players
+        self.min_players = min_players
+        self.report_every = report_every
+        self.clients = {}
+        self.snapshots = SnapshotEncoder()
+        self.tick = 0
+        self.tick_times = deque(maxlen=tick_rate * 10)
+        self._next_cid = 1
+        self._server = None
+        self._stopping = False
+        self._restart_timer = None
+
+        pygame.init()
+        self.scene = GameScene(pygame.Surface((800, 600)), None)
+        # nothing is rendered here; particles would only cost tick time
+        self.scene.particles.enabled = False
+        self.scene.history.enabled = False
+        # lobby until min_players have joined
+        self.scene.players = []
+        self.scene._move = []
+        self.scene.player_count = 0
+        self.scene.running = False
+        self.scene._death_timer = None
+        self.scene.wave = 1
+        self.started = False
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._stopping = True
+        for c in list(self.clients.values()):
+            c.writer.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    # --- connections ---
+    async def _handle_client(self, reader, writer):
+        cid = self._next_cid
+        self._next_cid += 1
+        conn = ClientConn(cid, writer)
+        try:
+            while not self._stopping:
+                kind, payload, size = await net.read_frame(reader)
+                conn.bytes_in += size
+                if kind == net.JOIN:
+                    self._join(conn, payload)
+                elif kind == net.INPUT:
+                    conn.inputs.append(net.INPUT_FMT.unpack(payload))
+                elif kind == net.ACK:
+                    conn.acked = max(conn.acked, net.ACK_FMT.unpack(payload)[0])
+                elif kind == net.BYE:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._leave(conn)
+            writer.close()
+
+    def _join(self, conn, payload):
+        if conn.player is not None:
+            return
+        info = json.loads(payload.decode('utf-8') or '{}')
+        conn.name = str(info.get('name') or conn.name)[:24]
+        conn.character = info.get('character')
+        if info.get('spectate'):
+            # spectators only receive snapshots and never take a player slot
+            conn.spectator = True
+            self.clients[conn.cid] = conn
+            conn.send(net.json_frame(net.WELCOME, {'player': None, 'tick_rate': self.tick_rate}))
+            return
+        if len(self._players()) >= self.max_players:
+            conn.send(net.json_frame(net.FULL, {'reason': 'server full'}))
+            return
+        self.clients[conn.cid] = conn
+        if self.started:
+            conn.player = self._claim_slot(conn)
+        elif len(self._players()) >= self.min_players:
+            # _start() welcomes the whole roster, including this client
+            self._start()
+            return
+        conn.send(net.json_frame(net.WELCOME, {'player': conn.player, 'tick_rate': self.tick_rate}))
+
+    def _players(self):
+        return [c for c in self.clients.values() if not c.spectator]
+
+    def _claim_slot(self, conn):
+        # reuse a slot left by a disconnected client before growing the list
+        for idx, p in enumerate(self.scene.players):
+            if p.get('disconnected'):
+                fresh = self.scene._make_player(p['pos'], conn.name, conn.character)
+                self.scene.players[idx] = fresh
+                if idx == 0:
+                    self.scene.player = fresh
+                return idx
+        return self.scene.add_player(conn.name, conn.character)
+
+    def _leave(self, conn):
+        if self.clients.pop(conn.cid, None) is None:
+            return
+        if conn.player is not None and conn.player < len(self.scene.players):
+            p = self.scene.players[conn.player]
+            p['disconnected'] = True
+            p['name'] = f'{conn.name} (left)'
+            self.scene._move[conn.player] = {'left': False, 'right': False, 'up': False, 'down': False}
+
+    def _start(self):
+        roster = self._players()
+        self.scene.state = {'progress': 0}
+        self.scene.on_enter(new=True, players=[{'username': c.name, 'character': c.character} for c in roster])
+        self.scene.player_count = len(self.scene.players)
+        for idx, c in enumerate(roster):
+            c.player = idx
+            c.send(net.json_frame(net.WELCOME, {'player': idx, 'tick_rate': self.tick_rate}))
+        self.started = True
+        self._restart_timer = None
+
+    # --- simulation ---
+    def _apply_inputs(self):
+        scene = self.scene
+        for c in self.clients.values():
+            if c.player is None:
+                c.inputs.clear()
+                continue
+            while c.inputs:
+                seq, buttons = c.inputs.popleft()
+                pressed = buttons & ~c.buttons
+                c.buttons = buttons
+                c.last_seq = seq
+                if pressed & net.ULT:
+                    scene._activate_ult(c.player)
+            mv = scene._move[c.player]
+            mv['left'] = bool(c.buttons & net.LEFT)
+            mv['right'] = bool(c.buttons & net.RIGHT)
+            mv['up'] = bool(c.buttons & net.UP)
+            mv['down'] = bool(c.buttons & net.DOWN)
+            # holding fire keeps shooting at the player's fire rate
+            if c.buttons & net.FIRE:
+                scene._fire_bullet(c.player)
+
+    def step(self):
+        t0 = time.perf_counter()
+        self._apply_inputs()
+        if self.started:
+            self.scene.update(self.dt)
+            if self.scene._death_timer is not None:
+                # everyone goes back to wave 1 once the death message has shown
+                if self._restart_timer is None:
+                    self._restart_timer = 3.0
+                self._restart_timer -= self.dt
+                if self._restart_timer <= 0 and self._players():
+                    self._start()
+        # one capture per tick; clients sharing an ack share the encoded delta
+        self.snapshots.capture(self.scene)
+        for c in list(self.clients.values()):
+            c.send(net.frame(net.STATE, self.snapshots.encode(c.acked)))
+        self.tick += 1
+        self.tick_times.append(time.perf_counter() - t0)
+
+    async def run(self, duration=None):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        next_tick = start
+        next_report = start + self.report_every
+        while not self._stopping:
+            now = loop.time()
+            if duration is not None and now - start >= duration:
+                break
+            if now < next_tick:
+                await asyncio.sleep(next_tick - now)
+                continue
+            self.step()
+            # drain socket buffers so slow clients do not grow memory unbounded
+            await asyncio.gather(*(c.writer.drain() for c in list(self.clients.values())), return_exceptions=True)
+            next_tick += self.dt
+            if now - next_tick > 0.25:
+                # fell far behind (debugger, suspend): resync instead of bursting
+                next_tick = now
+            if self.report_every and now >= next_report:
+                print(self.report())
+                next_report = now + self.report_every
+
+    def stats(self):
+        times = sorted(self.tick_times)
+        n = len(times)
+        out = {
+            'tick': self.tick,
+            'clients': len(self.clients),
+            'entities': len(self.scene.enemies) + len(self.scene.bullets) + len(self.scene.enemy_bullets),
+            'tick_ms_avg': (sum(times) / n * 1000.0) if n else 0.0,
+            'tick_ms_p99': (times[min(n - 1, int(n * 0.99))] * 1000.0) if n else 0.0,
+            'per_client': {},
+        }
+        now = time.perf_counter()
+        for c in self.clients.values():
+            secs = max(1e-6, now - c.connected_at)
+            out['per_client'][c.name] = {'down_Bps': c.bytes_out / secs, 'up_Bps': c.bytes_in / secs}
+        return out
+
+    def report(self):
+        st = self.stats()
+        lines = [f"tick {st['tick']}  clients {st['clients']}  entities {st['entities']}  tick avg {st['tick_ms_avg']:.2f} ms  p99 {st['tick_ms_p99']:.2f} ms"]
+        for name, bw in st['per_client'].items():
+            lines.append(f"  {name:<16} down {bw['down_Bps'] / 1024:7.1f} KiB/s  up {bw['up_Bps']:7.0f} B/s")
+        return '\n'.join(lines)
+
+
+async def scripted_client(host, port, name, duration, rate=20, seed=None, spectate=False):
+    """Loopback test client: joins, wanders and fires on a fixed script.
+
+    Snapshots are decoded and acknowledged like the real client does, so the
+    delta path is exercised end to end.
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(net.json_frame(net.JOIN, {'name': name, 'character': rng.choice(['warrior', 'mage', 'rogue']), 'spectate': spectate}))
+    received = {'frames': 0, 'bytes': 0, 'player': None, 'snapshots': 0}
+    decoder = SnapshotDecoder()
+
+    async def recv():
+        try:
+            while True:
+                kind, payload, size = await net.read_frame(reader)
+                received['frames'] += 1
+                received['bytes'] += size
+                if kind == net.WELCOME:
+                    received['player'] = json.loads(payload.decode('utf-8'))['player']
+                elif kind == net.STATE:
+                    seq = decoder.decode(payload)
+                    if seq is not None:
+                        received['snapshots'] += 1
+                        writer.write(net.ack_frame(seq))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    task = asyncio.ensure_future(recv())
+    loop = asyncio.get_running_loop()
+    end = loop.time() + duration
+    seq = 0
+    moves = [net.LEFT, net.RIGHT, net.UP, net.DOWN, net.LEFT | net.UP, net.RIGHT | net.DOWN, 0]
+    move = 0
+    while loop.time() < end:
+        if spectate:
+            await asyncio.sleep(0.1)
+            continue
+        seq += 1
+        if seq % rate == 0:
+            move = rng.choice(moves)
+        buttons = move | (net.FIRE if seq % 3 == 0 else 0) | (net.ULT if seq % (rate * 4) == 0 else 0)
+        writer.write(net.input_frame(seq, buttons))
+        await writer.drain()
+        await asyncio.sleep(1.0 / rate)
+    writer.write(net.frame(net.BYE))
+    await writer.drain()
+    writer.close()
+    task.cancel()
+    return received
+
+
+async def _main(args):
+    server = await GameServer(args.host, args.port, args.tick_rate, min_players=args.min_players).start()
+    print(f'listening on {args.host}:{server.port} at {args.tick_rate} Hz')
+    if not args.scripted:
+        await server.run()
+        return 0
+    clients = [scripted_client(args.host, server.port, f'bot{i + 1}', args.duration, seed=i) for i in range(args.scripted)]
+    clients += [scripted_client(args.host, server.port, f'spectator{i + 1}', args.duration, spectate=True) for i in range(args.spectators)]
+    results = await asyncio.gather(server.run(args.duration + 0.5), *clients)
+    print(server.report())
+    await server.stop()
+    failed = []
+    for i, r in enumerate(results[1:]):
+        name = f'bot{i + 1}' if i < args.scripted else f'spectator{i + 1 - args.scripted}'
+        if not r['snapshots'] or (r['player'] is None and i < args.scripted):
+            failed.append(name)
+        print(f"  {name}: player {r['player']}  snapshots {r['snapshots']}  {r['bytes'] / 1024:.1f} KiB")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Headless authoritative GameScene server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--tick-rate', type=int, default=30)
+    parser.add_argument('--min-players', type=int, default=1)
+    parser.add_argument('--scripted', type=int, default=0, help='run N scripted loopback clients and exit')
+    parser.add_argument('--spectators', type=int, default=0, help='extra scripted spectator clients with --scripted')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds to run with --scripted')
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,268 @@
+import struct
+from array import array
+from multiprocessing import shared_memory
+from snapshot import P_ULT, P_MAGE, P_GONE, P_BLEED, E_BOSS, E_PHASE2, B_MAGE_BIG, B_ULT, B_SPLIT, EB_BOSS, EB_SPECIAL
+
+# World state published into shared memory for external tools (bots,
+# dashboards, recorders) running next to the game.
+#
+# Layout (little-endian), all offsets fixed once the block is created:
+#
+#   header    HEADER_SIZE bytes: magic, version, slot count, slot size, the
+#             record capacity of each kind, and at LATEST_AT the number of
+#             the last frame written completely
+#   slots     `slots` slots of slot_size bytes; frame n lives in slot n % slots
+#
+# A slot starts with a seqlock counter (u64), then SLOT_HEAD (frame, sim
+# time, wave, scene flags, the record count of each kind) and then the
+# record arrays, one per kind in KINDS order, each sized for its capacity.
+# Every record is a row of float32 fields (FIELDS), so a reader can cast
+# the slot to 'f' (or numpy.frombuffer it) without unpacking anything.
+# Flag fields hold the bit sets of snapshot.py as small whole numbers.
+#
+# The writer makes the counter odd, writes the slot, makes it even again
+# and only then advances LATEST_AT. A reader that sees the same even
+# counter before and after reading has a consistent frame; with several
+# slots the writer only comes back to a slot `slots` frames later, so
+# readers rarely have to retry.
+
+MAGIC = b'SKWS'
+VERSION = 1
+DEFAULT_NAME = 'soulknight_world'
+
+HEADER = struct.Struct('<4sHHI4I')   # magic, version, slots, slot size, capacities
+LATEST = struct.Struct('<Q')
+LATEST_AT = 32
+HEADER_SIZE = 64
+SEQ = struct.Struct('<Q')
+SLOT_HEAD = struct.Struct('<QdII4I')  # frame, now, wave, flags, record counts (after the seq)
+SLOT_DATA = SEQ.size + SLOT_HEAD.size
+
+# scene flags
+RUNNING, DEAD, TRUNCATED = 1, 2, 4
+
+KINDS = ('players', 'enemies', 'bullets', 'enemy_bullets')
+FIELDS = {
+    'players': ('x', 'y', 'hp', 'max_hp', 'ult', 'flags'),
+    'enemies': ('x', 'y', 'vx', 'vy', 'hp', 'max_hp', 'flags'),
+    'bullets': ('x', 'y', 'vx', 'vy', 'flags'),
+    'enemy_bullets': ('x', 'y', 'vx', 'vy', 'flags'),
+}
+CAPACITY = {'players': 64, 'enemies': 8192, 'bullets': 1024, 'enemy_bullets': 8192}
+
+
+def _layout(capacity):
+    # (slot size, {kind: (float offset in the slot, capacity)})
+    offsets = {}
+    pos = SLOT_DATA
+    for kind in KINDS:
+        offsets[kind] = (pos // 4, capacity[kind])
+        pos += capacity[kind] * len(FIELDS[kind]) * 4
+    # keep every slot 8-byte aligned for the seq counters
+    return (pos + 7) & ~7, offsets
+
+
+class WorldPublisher:
+    """Writes GameScene's players, enemies and projectiles into shared memory.
+
+    publish(scene) is called once per simulation tick. Entities beyond a
+    kind's capacity are left out and the frame is flagged TRUNCATED.
+    The block is created under `name` (replacing a stale one left behind
+    by a crashed run) and unlinked again by close().
+    """
+
+    def __init__(self, name=DEFAULT_NAME, slots=4, capacity=None):
+        self.capacity = dict(CAPACITY, **(capacity or {}))
+        self.slots = slots
+        self.slot_size, self.offsets = _layout(self.capacity)
+        size = HEADER_SIZE + slots * self.slot_size
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = name
+        self.buf = self.shm.buf
+        self._floats = self.buf.cast('f')
+        HEADER.pack_into(self.buf, 0, MAGIC, VERSION, slots, self.slot_size, *(self.capacity[k] for k in KINDS))
+        LATEST.pack_into(self.buf, LATEST_AT, 0)
+        self._seqs = [0] * slots
+        self.frame = 0
+
+    def publish(self, scene):
+        frame = self.frame + 1
+        slot = frame % self.slots
+        base = HEADER_SIZE + slot * self.slot_size
+        buf = self.buf
+        seq = self._seqs[slot] + 1
+        SEQ.pack_into(buf, base, seq)
+
+        now = scene.now
+        rows = {k: [] for k in KINDS}
+        out = rows['players']
+        for p in scene.players:
+            flags = ((P_ULT if p.get('ult_active') else 0) | (P_MAGE if p.get('character') == 'mage' else 0)
+                     | (P_GONE if p.get('disconnected') else 0) | (P_BLEED if p.get('bleed_until', 0.0) > now else 0))
+            x, y = p['pos']
+            out += (x, y, p.get('hp', 0), p.get('max_hp', 100), p.get('ult_charge', 0) / (p.get('ult_max', 100) or 1), flags)
+        out = rows['enemies']
+        for e in scene.enemies:
+            x, y = e['pos']
+            vx, vy = e.get('vel') or (0.0, 0.0)
+            hp = e.get('hp', 1)
+            out += (x, y, vx, vy, hp, e.get('max_hp', hp),
+                    (E_BOSS if e.get('is_boss') else 0) | (E_PHASE2 if e.get('phase', 1) == 2 else 0))
+        out = rows['bullets']
+        for b in scene.bullets:
+            x, y = b['pos']
+            vx, vy = b['vel']
+            s = b.get('speed', 0.0)
+            out += (x, y, vx * s, vy * s,
+                    (B_MAGE_BIG if b.get('is_mage_big') else 0) | (B_ULT if b.get('ult') else 0) | (B_SPLIT if b.get('is_split') else 0))
+        out = rows['enemy_bullets']
+        for eb in scene.enemy_bullets:
+            x, y = eb['pos']
+            vx, vy = eb['vel']
+            s = eb.get('speed', 0.0)
+            out += (x, y, vx * s, vy * s, (EB_BOSS if eb.get('boss_bullet') else 0) | (EB_SPECIAL if eb.get('special') else 0))
+
+        flags = (RUNNING if scene.running else 0) | (DEAD if getattr(scene, '_death_timer', None) is not None else 0)
+        counts = []
+        floats = self._floats
+        for kind in KINDS:
+            data = rows[kind]
+            width = len(FIELDS[kind])
+            start, cap = self.offsets[kind]
+            n = len(data) // width
+            if n > cap:
+                n = cap
+                del data[cap * width:]
+                flags |= TRUNCATED
+            start += base // 4
+            floats[start:start + len(data)] = array('f', data)
+            counts.append(n)
+
+        SLOT_HEAD.pack_into(buf, base + SEQ.size, frame, now, scene.wave, flags, *counts)
+        SEQ.pack_into(buf, base, seq + 1)
+        self._seqs[slot] = seq + 1
+        LATEST.pack_into(buf, LATEST_AT, frame)
+        self.frame = frame
+
+    def close(self):
+        self._floats.release()
+        self.buf = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class WorldFrame:
+    """One published frame as seen by a reader.
+
+    The record arrays are memoryviews of float32 (rows of FIELDS[kind]).
+    From WorldReader.view() they point straight into shared memory and
+    stay correct only while valid() is true; from read() they are a copy.
+    """
+
+    def __init__(self, frame, now, wave, flags, arrays, check=None):
+        self.frame = frame
+        self.now = now
+        self.wave = wave
+        self.flags = flags
+        self.arrays = arrays
+        self._check = check
+
+    def valid(self):
+        return self._check is None or self._check()
+
+    def count(self, kind):
+        return len(self.arrays[kind]) // len(FIELDS[kind])
+
+    def records(self, kind):
+        # rows of kind as tuples, in FIELDS[kind] order
+        data = self.arrays[kind].tolist()
+        width = len(FIELDS[kind])
+        return [tuple(data[i:i + width]) for i in range(0, len(data), width)]
+
+
+class WorldReader:
+    """Attaches to a WorldPublisher's block from any process.
+
+    read() returns a consistent copy of the newest frame (or None before the
+    first one); view() returns the newest frame without copying it, for
+    consumers that can check valid() after they are done. Neither call
+    takes a lock or ever makes the game wait. Views must be dropped
+    before close().
+    """
+
+    def __init__(self, name=DEFAULT_NAME):
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # before Python 3.13 the resource tracker would unlink the
+            # game's block when this process exits
+            from multiprocessing import resource_tracker
+            self.shm = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+        self.buf = self.shm.buf
+        magic, version, self.slots, self.slot_size, *caps = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.shm.close()
+            raise ValueError(f'{name}: not a world state block (magic {magic!r}, version {version})')
+        self.capacity = dict(zip(KINDS, caps))
+        _, self.offsets = _layout(self.capacity)
+        self._floats = self.buf.cast('f')
+
+    def latest(self):
+        # number of the newest complete frame (0 before the first)
+        return LATEST.unpack_from(self.buf, LATEST_AT)[0]
+
+    def _slot(self, frame):
+        base = HEADER_SIZE + (frame % self.slots) * self.slot_size
+        seq = SEQ.unpack_from(self.buf, base)[0]
+        if seq & 1:
+            return None
+        head = SLOT_HEAD.unpack_from(self.buf, base + SEQ.size)
+        if head[0] != frame:
+            return None
+        arrays = {}
+        floats = self._floats
+        for kind, n in zip(KINDS, head[4:]):
+            start = base // 4 + self.offsets[kind][0]
+            arrays[kind] = floats[start:start + n * len(FIELDS[kind])]
+        return base, seq, head, arrays
+
+    def _unchanged(self, base, seq):
+        return SEQ.unpack_from(self.buf, base)[0] == seq
+
+    def view(self, retries=8):
+        for _ in range(retries):
+            frame = self.latest()
+            if not frame:
+                return None
+            got = self._slot(frame)
+            if got is None:
+                continue
+            base, seq, head, arrays = got
+            return WorldFrame(head[0], head[1], head[2], head[3], arrays, lambda: self._unchanged(base, seq))
+        return None
+
+    def read(self, retries=8):
+        for _ in range(retries):
+            frame = self.latest()
+            if not frame:
+                return None
+            got = self._slot(frame)
+            if got is None:
+                continue
+            base, seq, head, arrays = got
+            arrays = {kind: memoryview(data.tobytes()).cast('f') for kind, data in arrays.items()}
+            if self._unchanged(base, seq):
+                return WorldFrame(head[0], head[1], head[2], head[3], arrays)
+        return None
+
+    def close(self):
+        self._floats.release()
+        self.buf = None
+        self.shm.close()
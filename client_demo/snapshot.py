@@ -0,0 +1,359 @@
+import struct
+
+# Quantized, delta-compressed world snapshots for network sync and spectating.
+#
+# A snapshot is {kind: {netid: record}} where a record is a tuple of small
+# integers: 16-bit fixed-point x/y inside the playfield (plus a margin for
+# projectiles leaving the screen), then per-kind fields ending with a
+# bit-packed flags byte (player records also carry the name last). Each
+# packet is encoded against the last snapshot the receiver acknowledged: only
+# removed ids, new entities and changed fields go out, and position changes
+# are sent as int8 or packed int12 deltas when they fit.
+
+FIELD_W, FIELD_H = 800, 600
+MARGIN = 32
+QX = 65535.0 / (FIELD_W + 2 * MARGIN)
+QY = 65535.0 / (FIELD_H + 2 * MARGIN)
+
+VERSION = 1
+HEADER = struct.Struct('!BIIHBB')  # version, seq, base seq, wave, player count, scene flags
+
+# scene flags
+RUNNING, DEAD = 1, 2
+
+# per-kind flag bits
+P_ULT, P_MAGE, P_GONE, P_BLEED = 1, 2, 4, 8
+E_BOSS, E_PHASE2 = 1, 2
+B_MAGE_BIG, B_ULT, B_SPLIT = 1, 2, 4
+EB_BOSS, EB_SPECIAL = 1, 2
+
+# change mask bits: 0 x, 1 y, 2 int8 position delta, 3..6 extra fields, 7 int12 position delta
+M_X, M_Y, M_SMALL, M_MED = 1, 2, 4, 128
+
+# kind -> struct codes of the fields after x/y (the last one is always flags)
+KINDS = (
+    ('p', 'HHBB'),   # hp, max_hp, ult charge (percent), flags; the name only goes out with new entries
+    ('e', 'HHB'),    # hp, max_hp, flags
+    ('b', 'B'),      # flags
+    ('eb', 'B'),     # flags
+)
+_PACKERS = {kind: [struct.Struct('!' + c) for c in codes] for kind, codes in KINDS}
+_U16 = struct.Struct('!H')
+_I8X2 = struct.Struct('!bb')
+_U16X2 = struct.Struct('!HH')
+
+
+def quantize(x, y):
+    qx = int((x + MARGIN) * QX + 0.5)
+    qy = int((y + MARGIN) * QY + 0.5)
+    return (0 if qx < 0 else 65535 if qx > 65535 else qx,
+            0 if qy < 0 else 65535 if qy > 65535 else qy)
+
+
+def dequantize(qx, qy):
+    return qx / QX - MARGIN, qy / QY - MARGIN
+
+
+def _clamp16(v):
+    v = int(v + 0.5)
+    return 0 if v < 0 else 65535 if v > 65535 else v
+
+
+def _put_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(buf, i):
+    n = shift = 0
+    while True:
+        b = buf[i]
+        i += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, i
+        shift += 7
+
+
+class SnapshotEncoder:
+    """Server side: captures GameScene state and encodes per-receiver deltas."""
+
+    def __init__(self, history=64):
+        self.history = history
+        self.seq = 0
+        self.snapshots = {}
+        # id(obj) -> (obj, netid); holding obj keeps its id() from being reused
+        self._ids = {}
+        self._next_id = 1
+        self._cache = {}
+
+    def _netid(self, obj, ids):
+        entry = self._ids.get(id(obj))
+        if entry is None or entry[0] is not obj:
+            entry = (obj, self._next_id)
+            self._next_id += 1
+        ids[id(obj)] = entry
+        return entry[1]
+
+    def capture(self, scene):
+        # snapshot the scene; returns the new sequence number
+        ids = {}
+        players = {}
+        for idx, p in enumerate(scene.players):
+            flags = ((P_ULT if p.get('ult_active') else 0) | (P_MAGE if p.get('character') == 'mage' else 0)
+                     | (P_GONE if p.get('disconnected') else 0) | (P_BLEED if p.get('bleed_until', 0.0) > scene.now else 0))
+            ult = int(100 * p.get('ult_charge', 0) / (p.get('ult_max', 100) or 1))
+            players[idx] = quantize(*p['pos']) + (_clamp16(p.get('hp', 0)), _clamp16(p.get('max_hp', 100)), min(255, ult), flags, p.get('name', f'Player{idx + 1}'))
+        enemies = {}
+        for e in scene.enemies:
+            flags = (E_BOSS if e.get('is_boss') else 0) | (E_PHASE2 if e.get('phase', 1) == 2 else 0)
+            enemies[self._netid(e, ids)] = quantize(*e['pos']) + (_clamp16(e.get('hp', 1)), _clamp16(e.get('max_hp', e.get('hp', 1))), flags)
+        bullets = {}
+        for b in scene.bullets:
+            flags = (B_MAGE_BIG if b.get('is_mage_big') else 0) | (B_ULT if b.get('ult') else 0) | (B_SPLIT if b.get('is_split') else 0)
+            bullets[self._netid(b, ids)] = quantize(*b['pos']) + (flags,)
+        enemy_bullets = {}
+        for eb in scene.enemy_bullets:
+            flags = (EB_BOSS if eb.get('boss_bullet') else 0) | (EB_SPECIAL if eb.get('special') else 0)
+            enemy_bullets[self._netid(eb, ids)] = quantize(*eb['pos']) + (flags,)
+        self._ids = ids
+
+        self.seq += 1
+        scene_flags = (RUNNING if scene.running else 0) | (DEAD if getattr(scene, '_death_timer', None) is not None else 0)
+        self.snapshots[self.seq] = {
+            'head': (scene.wave & 0xFFFF, min(255, scene.player_count), scene_flags),
+            'p': players, 'e': enemies, 'b': bullets, 'eb': enemy_bullets,
+        }
+        self.snapshots.pop(self.seq - self.history, None)
+        self._cache = {}
+        return self.seq
+
+    def encode(self, base_seq=0):
+        # delta of the latest snapshot against base_seq (0 or unknown -> full)
+        if base_seq not in self.snapshots:
+            base_seq = 0
+        cached = self._cache.get(base_seq)
+        if cached is not None:
+            return cached
+        cur = self.snapshots[self.seq]
+        base = self.snapshots.get(base_seq)
+        wave, pcount, sflags = cur['head']
+        out = bytearray(HEADER.pack(VERSION, self.seq, base_seq, wave, pcount, sflags))
+        for kind, _ in KINDS:
+            self._encode_kind(out, kind, cur[kind], base[kind] if base else {})
+        data = bytes(out)
+        self._cache[base_seq] = data
+        return data
+
+    def _encode_kind(self, out, kind, cur, base):
+        # three sections: removed ids, new entities (full records), changed entities
+        removed = sorted(nid for nid in base if nid not in cur)
+        added = []
+        changed = []
+        for nid, rec in cur.items():
+            old = base.get(nid)
+            if old is None or (kind == 'p' and old[-1] != rec[-1]):
+                # new entity (or a player slot taken over by someone else)
+                added.append((nid, rec))
+            elif old != rec:
+                changed.append((nid, rec, old))
+        added.sort()
+        changed.sort()
+
+        _put_varint(out, len(removed))
+        prev = 0
+        for nid in removed:
+            _put_varint(out, nid - prev)
+            prev = nid
+
+        packers = _PACKERS[kind]
+        _put_varint(out, len(added))
+        prev = 0
+        for nid, rec in added:
+            _put_varint(out, nid - prev)
+            prev = nid
+            out += _U16X2.pack(rec[0], rec[1])
+            for i, pk in enumerate(packers):
+                out += pk.pack(rec[2 + i])
+            if kind == 'p':
+                name = rec[-1].encode('utf-8')[:255]
+                out.append(len(name))
+                out += name
+
+        _put_varint(out, len(changed))
+        prev = 0
+        for nid, rec, old in changed:
+            _put_varint(out, nid - prev)
+            prev = nid
+            dx = rec[0] - old[0]
+            dy = rec[1] - old[1]
+            mask = (M_X if dx else 0) | (M_Y if dy else 0)
+            if mask:
+                if -128 <= dx <= 127 and -128 <= dy <= 127:
+                    mask |= M_SMALL
+                elif -2048 <= dx <= 2047 and -2048 <= dy <= 2047:
+                    mask |= M_MED
+            for i in range(len(packers)):
+                if rec[2 + i] != old[2 + i]:
+                    mask |= 1 << (3 + i)
+            out.append(mask)
+            if mask & M_SMALL:
+                out += _I8X2.pack(dx, dy)
+            elif mask & M_MED:
+                # two signed 12-bit deltas in three bytes
+                v = ((dx & 0xFFF) << 12) | (dy & 0xFFF)
+                out += bytes(((v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF))
+            else:
+                if mask & M_X:
+                    out += _U16.pack(rec[0])
+                if mask & M_Y:
+                    out += _U16.pack(rec[1])
+            for i, pk in enumerate(packers):
+                if mask & (1 << (3 + i)):
+                    out += pk.pack(rec[2 + i])
+
+
+class SnapshotDecoder:
+    """Client side: rebuilds snapshots from deltas and patches entity dicts in place.
+
+    `entities[kind]` maps netid -> the dict handed to the renderer; dicts are
+    created when an entity appears, mutated when it changes and dropped when
+    it is removed, so unchanged entities cost nothing per packet.
+    """
+
+    def __init__(self, history=64):
+        self.history = history
+        self.snapshots = {0: {kind: {} for kind, _ in KINDS}}
+        self.entities = {kind: {} for kind, _ in KINDS}
+        self.seq = 0
+        self.head = (1, 0, 0)
+
+    def decode(self, data):
+        # returns the sequence number to acknowledge, or None for a stale packet
+        version, seq, base_seq, wave, pcount, sflags = HEADER.unpack_from(data)
+        if version != VERSION:
+            raise ValueError(f'snapshot version {version} not supported')
+        base = self.snapshots.get(base_seq)
+        if base is None or seq <= self.seq:
+            return None
+        i = HEADER.size
+        snap = {}
+        for kind, _ in KINDS:
+            i, snap[kind] = self._decode_kind(data, i, kind, base[kind])
+        self.snapshots[seq] = snap
+        for old in [s for s in self.snapshots if 0 < s <= seq - self.history]:
+            del self.snapshots[old]
+        self.seq = seq
+        self.head = (wave, pcount, sflags)
+        self._apply(snap)
+        return seq
+
+    def _decode_kind(self, data, i, kind, base):
+        recs = dict(base)
+        n, i = _get_varint(data, i)
+        nid = 0
+        for _ in range(n):
+            d, i = _get_varint(data, i)
+            nid += d
+            recs.pop(nid, None)
+
+        packers = _PACKERS[kind]
+        n, i = _get_varint(data, i)
+        nid = 0
+        for _ in range(n):
+            d, i = _get_varint(data, i)
+            nid += d
+            rec = list(_U16X2.unpack_from(data, i))
+            i += 4
+            for pk in packers:
+                rec.append(pk.unpack_from(data, i)[0])
+                i += pk.size
+            if kind == 'p':
+                ln = data[i]
+                rec.append(data[i + 1:i + 1 + ln].decode('utf-8', 'replace'))
+                i += 1 + ln
+            recs[nid] = tuple(rec)
+
+        n, i = _get_varint(data, i)
+        nid = 0
+        for _ in range(n):
+            d, i = _get_varint(data, i)
+            nid += d
+            mask = data[i]
+            i += 1
+            rec = list(recs[nid])
+            if mask & M_SMALL:
+                dx, dy = _I8X2.unpack_from(data, i)
+                i += 2
+                rec[0] += dx
+                rec[1] += dy
+            elif mask & M_MED:
+                v = (data[i] << 16) | (data[i + 1] << 8) | data[i + 2]
+                i += 3
+                dx, dy = v >> 12, v & 0xFFF
+                rec[0] += dx - 0x1000 if dx & 0x800 else dx
+                rec[1] += dy - 0x1000 if dy & 0x800 else dy
+            else:
+                if mask & M_X:
+                    rec[0] = _U16.unpack_from(data, i)[0]
+                    i += 2
+                if mask & M_Y:
+                    rec[1] = _U16.unpack_from(data, i)[0]
+                    i += 2
+            for k, pk in enumerate(packers):
+                if mask & (1 << (3 + k)):
+                    rec[2 + k] = pk.unpack_from(data, i)[0]
+                    i += pk.size
+            recs[nid] = tuple(rec)
+        return i, recs
+
+    def _apply(self, snap):
+        for kind, _ in KINDS:
+            live = self.entities[kind]
+            recs = snap[kind]
+            for nid in [n for n in live if n not in recs]:
+                del live[nid]
+            for nid, rec in recs.items():
+                ent = live.get(nid)
+                if ent is None:
+                    ent = live[nid] = {'pos': [0.0, 0.0], '_rec': None}
+                if ent['_rec'] is rec:
+                    continue
+                ent['_rec'] = rec
+                pos = ent['pos']
+                pos[0], pos[1] = dequantize(rec[0], rec[1])
+                flags = rec[len(_PACKERS[kind]) + 1]
+                if kind == 'p':
+                    ent['hp'], ent['max_hp'], ent['ult_charge'] = rec[2], rec[3], rec[4]
+                    ent['ult_max'] = 100
+                    ent['ult_active'] = bool(flags & P_ULT)
+                    ent['character'] = 'mage' if flags & P_MAGE else None
+                    ent['disconnected'] = bool(flags & P_GONE)
+                    ent['bleeding'] = bool(flags & P_BLEED)
+                    ent['name'] = rec[6]
+                elif kind == 'e':
+                    ent['hp'], ent['max_hp'] = rec[2], rec[3]
+                    ent['is_boss'] = bool(flags & E_BOSS)
+                    ent['phase'] = 2 if flags & E_PHASE2 else 1
+                elif kind == 'b':
+                    ent['is_mage_big'] = bool(flags & B_MAGE_BIG)
+                    ent['ult'] = bool(flags & B_ULT)
+                    ent['is_split'] = bool(flags & B_SPLIT)
+                else:
+                    ent['boss_bullet'] = bool(flags & EB_BOSS)
+                    ent['special'] = bool(flags & EB_SPECIAL)
+
+    def apply_to(self, scene):
+        # point the scene's entity lists at the decoded dicts (players in slot order)
+        ents = self.entities
+        scene.players = [ents['p'][k] for k in sorted(ents['p'])]
+        scene.enemies = list(ents['e'].values())
+        scene.bullets = list(ents['b'].values())
+        scene.enemy_bullets = list(ents['eb'].values())
+        wave, pcount, sflags = self.head
+        scene.wave = wave
+        scene.player_count = pcount
+        scene.running = bool(sflags & RUNNING)
+        return bool(sflags & DEAD)
@@ -0,0 +1,160 @@
+import math
+import random
+
+from rewind import copy_entity
+
+
+# deadline fields a queued enemy carries as delays until it is materialized
+DEADLINES = ('fire_at', 'summon_at', 'special_at')
+
+
+class WaveSpawner:
+    """Spreads wave spawning over frames.
+
+    While a wave is being fought, update() draws the random numbers for
+    the next wave's spawn plan a few enemies per frame. When the wave is
+    cleared, start_wave() only places the prepared plan around the current
+    view and queues the enemies; update() then materializes at most
+    `per_frame` of them per frame. Boss summons go through the same queue.
+
+    Everything is drawn from the global random module on the simulation
+    thread, so seeded runs stay reproducible and the whole spawner state
+    fits in a world snapshot.
+    """
+
+    def __init__(self, per_frame=4, plan_per_frame=4):
+        self.per_frame = per_frame
+        self.plan_per_frame = plan_per_frame
+        self.plan = None
+        self.pending = []
+
+    def clear(self):
+        self.plan = None
+        self.pending = []
+
+    def drop_pending(self):
+        # queued enemies that have not appeared yet (e.g. summons when the boss dies)
+        self.pending = []
+
+    def queue(self, enemy):
+        # enemy's deadline fields are delays from the moment it appears
+        self.pending.append(enemy)
+
+    # --- plan generation ---
+    def _new_plan(self, scene, wave):
+        t = scene.tuning
+        plan = {'wave': wave, 'tuning': t, 'duo': scene.player_count > 1, 'members': []}
+        if wave % t['boss_wave_every'] == 0:
+            # the boss, plus a second one when more than one player is in
+            plan['boss'] = True
+            plan['count'] = 2 if plan['duo'] else 1
+        else:
+            plan['boss'] = False
+            count = random.randint(t['enemy_count_min'], t['enemy_count_max'])
+            plan['count'] = count + max(0, (wave - 1) // t['enemy_count_waves_per_extra'])
+            # candidate cluster centres as fractions of the spawn area
+            plan['centers'] = [(random.random(), random.random()) for _ in range(16)]
+            plan['fallback'] = (random.random() < 0.5, random.random())
+        return plan
+
+    def _draw_member(self, plan):
+        t = plan['tuning']
+        wave = plan['wave']
+        if plan['boss']:
+            first = not plan['members']
+            hp = (t['boss_hp_base'] if first else t['boss2_hp_base']) + (wave - 1) * t['boss_hp_per_wave']
+            # (left side?, vertical fraction, vx, vy, hp, first shot, first special)
+            return (random.random() < 0.5, random.random(), random.uniform(-40.0, 40.0), random.uniform(-40.0, 40.0),
+                    hp, 0.8 if first else 1.0, 5.0 if first else 6.0)
+        scale = 1.0 + (wave - 1) * t['speed_scale_per_wave']
+        # (angle, radius, vx, vy, speed, first shot, hp)
+        return (random.uniform(0, math.tau), random.uniform(20, 100),
+                random.uniform(-24, 24) * scale, random.uniform(-24, 24) * scale, random.uniform(24, 48) * scale,
+                random.uniform(t['enemy_fire_min'], t['enemy_fire_max']), 1 + (wave - 1) // t['enemy_hp_waves_per_extra'])
+
+    def _prepare(self, scene, wave, budget):
+        # advance the plan for `wave` by up to `budget` members (None: finish it)
+        plan = self.plan
+        if plan is None or plan['wave'] != wave or plan['tuning'] is not scene.tuning or plan['duo'] != (scene.player_count > 1):
+            plan = self.plan = self._new_plan(scene, wave)
+        members = plan['members']
+        while len(members) < plan['count'] and (budget is None or budget > 0):
+            members.append(self._draw_member(plan))
+            if budget is not None:
+                budget -= 1
+        return plan
+
+    # --- per frame ---
+    def update(self, scene):
+        pending = self.pending
+        if pending:
+            now = scene.now
+            batch = pending[:self.per_frame]
+            del pending[:self.per_frame]
+            for e in batch:
+                for key in DEADLINES:
+                    if key in e:
+                        e[key] += now
+                scene._add_enemy(e)
+        elif not scene._awaiting_next_wave:
+            self._prepare(scene, scene.wave + 1, self.plan_per_frame)
+
+    def start_wave(self, scene):
+        # place the plan for scene.wave around the current view and queue it
+        plan = self._prepare(scene, scene.wave, None)
+        self.plan = None
+        self.pending = []
+        view = scene.camera.rect
+        left, top = view.left + 80, view.top + 80
+        span_w, span_h = view.width - 160, view.height - 160
+        if plan['boss']:
+            summon = plan['tuning']['boss_summon_every']
+            for side, v, vx, vy, hp, fire, special in plan['members']:
+                self.pending.append({
+                    'pos': [left if side else view.right - 80, top + v * span_h],
+                    'vel': [vx, vy],
+                    'speed': 0.0,
+                    'is_boss': True,
+                    'hp': hp,
+                    'max_hp': hp,
+                    'phase': 1,
+                    'fire_at': fire,
+                    'summon_at': summon,
+                    'special_at': special,
+                })
+            return
+        # a cluster away from the primary player, loosely spread
+        px, py = scene.player['pos']
+        center = None
+        for u, v in plan['centers']:
+            cx, cy = left + u * span_w, top + v * span_h
+            if math.hypot(cx - px, cy - py) > 160:
+                center = (cx, cy)
+                break
+        if center is None:
+            side, v = plan['fallback']
+            center = (left if side else view.right - 80, top + v * span_h)
+        for angle, radius, vx, vy, speed, fire, hp in plan['members']:
+            self.pending.append({
+                'pos': [center[0] + math.cos(angle) * radius, center[1] + math.sin(angle) * radius],
+                'vel': [vx, vy],
+                'speed': speed,
+                'fire_at': fire,
+                'hp': hp,
+            })
+
+    # --- world snapshots ---
+    def snapshot(self):
+        plan = self.plan
+        if plan is not None:
+            plan = dict(plan)
+            plan['members'] = plan['members'][:]
+        return plan, [copy_entity(e) for e in self.pending]
+
+    def restore(self, state):
+        plan, pending = state
+        if plan is not None:
+            plan = dict(plan)
+            plan['members'] = plan['members'][:]
+        self.plan = plan
+        self.pending = [copy_entity(e) for e in pending]
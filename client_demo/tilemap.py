@@ -0,0 +1,234 @@
+import os
+import random
+from collections import OrderedDict
+import pygame
+
+
+MAPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'maps')
+
+
+def _rgb(text):
+    return tuple(int(c) for c in text.split(','))
+
+
+class TileMap:
+    """A grid of floor tiles pre-rendered into cached chunk surfaces.
+
+    Map files (maps/<id>.map) are plain text: 'key: value' header lines,
+    a 'tiles:' section with one '<char> <name> <r,g,b> [<r,g,b>] [grid] [solid]'
+    definition per line (optional detail colour for speckles, 'grid' for an
+    outlined flagstone look, 'solid' for walls nothing can walk through), a
+    '--' separator and then one character per tile, row by row.
+
+    Chunks of chunk x chunk tiles are rendered on first use and kept in a
+    small LRU cache, so drawing a frame is a handful of chunk blits however
+    big the map is.
+    """
+
+    def __init__(self, name, tile, grid, tiles, spawn=None, chunk=8, max_chunks=48):
+        self.name = name
+        self.tile = tile
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if grid else 0
+        self.chars = ''.join(sorted(tiles))
+        index = {ch: i for i, ch in enumerate(self.chars)}
+        self.defs = [tiles[ch] for ch in self.chars]
+        # one byte per tile, row-major
+        self.cells = bytearray(index[ch] for row in grid for ch in row)
+        # 1 for every wall tile, same layout as cells
+        solid = [1 if d.get('solid') else 0 for d in self.defs]
+        self.solid = bytearray(solid[i] for i in self.cells)
+        self.world_size = (self.cols * tile, self.rows * tile)
+        if spawn is None:
+            self.spawn = (self.world_size[0] / 2.0, self.world_size[1] / 2.0)
+        else:
+            self.spawn = ((spawn[0] + 0.5) * tile, (spawn[1] + 0.5) * tile)
+        self.chunk = chunk
+        self.chunk_px = chunk * tile
+        self.max_chunks = max_chunks
+        self._chunks = OrderedDict()
+        self._tiles = None
+
+    @classmethod
+    def load(cls, map_id, maps_dir=MAPS_DIR):
+        path = os.path.join(maps_dir, f'{map_id}.map')
+        header = {}
+        tiles = {}
+        grid = []
+        section = 'header'
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if section == 'grid':
+                    if line:
+                        grid.append(line)
+                elif section == 'tiles':
+                    if line == '--':
+                        section = 'grid'
+                    elif line.strip():
+                        parts = line.split()
+                        tiles[line[0]] = {
+                            'name': parts[1],
+                            'color': _rgb(parts[2]),
+                            'detail': _rgb(parts[3]) if len(parts) > 3 and ',' in parts[3] else None,
+                            'grid': 'grid' in parts[3:],
+                            'solid': 'solid' in parts[3:],
+                        }
+                elif line.strip() == 'tiles:':
+                    section = 'tiles'
+                elif line.strip() and not line.startswith('#'):
+                    key, _, value = line.partition(':')
+                    header[key.strip()] = value.strip()
+        if not grid or any(len(row) != len(grid[0]) for row in grid):
+            raise ValueError(f'{path}: tile rows must all be the same width')
+        unknown = set(''.join(grid)) - set(tiles)
+        if unknown:
+            raise ValueError(f'{path}: undefined tiles {"".join(sorted(unknown))!r}')
+        spawn = tuple(int(v) for v in header['spawn'].split()) if 'spawn' in header else None
+        return cls(header.get('name', map_id), int(header.get('tile', 32)), grid, tiles, spawn)
+
+    @classmethod
+    def arena(cls, size=(800, 600), color=(10, 40, 10), tile=40):
+        # the original single-screen playfield as a one-tile map
+        cols, rows = size[0] // tile, size[1] // tile
+        return cls('Arena', tile, ['.' * cols] * rows, {'.': {'name': 'floor', 'color': color, 'detail': None, 'grid': False, 'solid': False}})
+
+    def tile_at(self, x, y):
+        # tile definition under world position (x, y), or None outside the map
+        c = int(x // self.tile)
+        r = int(y // self.tile)
+        if 0 <= c < self.cols and 0 <= r < self.rows:
+            return self.defs[self.cells[r * self.cols + c]]
+        return None
+
+    def _tile_surfaces(self):
+        # a few pre-drawn variants per tile type so large areas do not look stamped
+        if self._tiles is None:
+            ts = self.tile
+            self._tiles = []
+            for d in self.defs:
+                variants = []
+                for v in range(4 if d['detail'] else 1):
+                    surf = pygame.Surface((ts, ts))
+                    surf.fill(d['color'])
+                    if d['detail']:
+                        rng = random.Random(f"{d['name']}:{v}")
+                        for _ in range(ts // 6):
+                            s = rng.randint(1, 3)
+                            surf.fill(d['detail'], (rng.randrange(ts - s), rng.randrange(ts - s), s, s))
+                    if d['grid']:
+                        edge = tuple(max(0, c - 18) for c in d['color'])
+                        pygame.draw.rect(surf, edge, surf.get_rect(), 1)
+                    variants.append(surf)
+                self._tiles.append(variants)
+        return self._tiles
+
+    def _render_chunk(self, cx, cy):
+        tiles = self._tile_surfaces()
+        ts = self.tile
+        c0, r0 = cx * self.chunk, cy * self.chunk
+        c1, r1 = min(self.cols, c0 + self.chunk), min(self.rows, r0 + self.chunk)
+        surf = pygame.Surface(((c1 - c0) * ts, (r1 - r0) * ts))
+        cells = self.cells
+        cols = self.cols
+        blits = []
+        for r in range(r0, r1):
+            for c in range(c0, c1):
+                variants = tiles[cells[r * cols + c]]
+                blits.append((variants[(c * 7 + r * 13) % len(variants)], ((c - c0) * ts, (r - r0) * ts)))
+        surf.blits(blits, False)
+        return surf
+
+    def _store(self, key, surf):
+        self._chunks[key] = surf
+        if len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+
+    def chunk_surface(self, cx, cy):
+        key = (cx, cy)
+        surf = self._chunks.get(key)
+        if surf is not None:
+            self._chunks.move_to_end(key)
+            return surf
+        surf = self._render_chunk(cx, cy)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        self._store(key, surf)
+        return surf
+
+    def prerender(self, view_size=(800, 600)):
+        # render the chunks around the spawn point without touching the
+        # display (safe off the main thread); convert_chunks() finishes them
+        w, h = view_size
+        sx, sy = self.spawn
+        cp = self.chunk_px
+        cx0, cx1 = max(0, int(sx - w) // cp), min((self.cols - 1) // self.chunk, int(sx + w) // cp)
+        cy0, cy1 = max(0, int(sy - h) // cp), min((self.rows - 1) // self.chunk, int(sy + h) // cp)
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                if (cx, cy) not in self._chunks:
+                    self._store((cx, cy), self._render_chunk(cx, cy))
+
+    def convert_chunks(self):
+        # main thread: move prerendered chunks into the display format
+        if pygame.display.get_surface() is None:
+            return
+        for key, surf in list(self._chunks.items()):
+            self._chunks[key] = surf.convert()
+
+    def draw(self, surface, view):
+        # blit the chunks overlapping view (a world-space Rect) onto surface
+        cp = self.chunk_px
+        cx0 = max(0, view.left // cp)
+        cy0 = max(0, view.top // cp)
+        cx1 = min((self.cols - 1) // self.chunk, (view.right - 1) // cp)
+        cy1 = min((self.rows - 1) // self.chunk, (view.bottom - 1) // cp)
+        blits = []
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                blits.append((self.chunk_surface(cx, cy), (cx * cp - view.left, cy * cp - view.top)))
+        surface.blits(blits, False)
+
+
+class Camera:
+    """Screen-sized window onto the world that follows a set of points."""
+
+    def __init__(self, view_size, world_size, smoothing=8.0):
+        self.w, self.h = view_size
+        self.world_w, self.world_h = world_size
+        self.smoothing = smoothing
+        self.x = 0.0
+        self.y = 0.0
+
+    def _target(self, points):
+        if not points:
+            return self.x, self.y
+        cx = sum(p[0] for p in points) / len(points)
+        cy = sum(p[1] for p in points) / len(points)
+        # maps smaller than the screen are centred instead of clamped
+        if self.world_w <= self.w:
+            tx = (self.world_w - self.w) / 2.0
+        else:
+            tx = min(max(cx - self.w / 2.0, 0.0), self.world_w - self.w)
+        if self.world_h <= self.h:
+            ty = (self.world_h - self.h) / 2.0
+        else:
+            ty = min(max(cy - self.h / 2.0, 0.0), self.world_h - self.h)
+        return tx, ty
+
+    def snap(self, points):
+        self.x, self.y = self._target(points)
+
+    def follow(self, points, dt):
+        tx, ty = self._target(points)
+        k = min(1.0, self.smoothing * dt)
+        self.x += (tx - self.x) * k
+        self.y += (ty - self.y) * k
+
+    @property
+    def offset(self):
+        return int(self.x), int(self.y)
+
+    @property
+    def rect(self):
+        return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
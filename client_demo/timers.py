@@ -0,0 +1,102 @@
+import math
+
+
+class TimerWheel:
+    """Hierarchical timing wheel for simulation-time deadlines.
+
+    Deadlines are rounded up to `resolution` seconds (ticks). Level 0 holds
+    the next `slots` ticks one slot per tick; each higher level covers
+    `slots` times the span of the one below and is cascaded down when the
+    lower level wraps. Scheduling and cancelling are O(1) and advance() only
+    touches the slots it passes plus the entries that actually expire, so
+    the per-frame cost does not depend on how many timers are pending.
+
+    Callbacks are called as fn(arg). Cancelling is lazy: the entry is
+    flagged and skipped when its slot comes up.
+    """
+
+    def __init__(self, resolution=1.0 / 240, slot_bits=6, levels=4):
+        self.resolution = resolution
+        self.bits = slot_bits
+        self.slots = 1 << slot_bits
+        self.mask = self.slots - 1
+        self.levels = levels
+        self.max_delta = (1 << (slot_bits * levels)) - 1
+        self.wheels = [[[] for _ in range(self.slots)] for _ in range(levels)]
+        self.current = 0
+        self.pending = 0
+
+    def _insert(self, entry):
+        tick = entry[0]
+        delta = tick - self.current
+        if delta > self.max_delta:
+            tick = entry[0] = self.current + self.max_delta
+            delta = self.max_delta
+        level = 0
+        while delta >= self.slots << (self.bits * level):
+            level += 1
+        self.wheels[level][(tick >> (self.bits * level)) & self.mask].append(entry)
+
+    def schedule(self, deadline, fn, arg=None):
+        # returns a handle that can be passed to cancel()
+        tick = int(math.ceil(deadline / self.resolution - 1e-9))
+        if tick <= self.current:
+            tick = self.current + 1
+        entry = [tick, fn, arg, True]
+        self._insert(entry)
+        self.pending += 1
+        return entry
+
+    def cancel(self, entry):
+        if entry is not None and entry[3]:
+            entry[3] = False
+            self.pending -= 1
+
+    def clear(self, now=0.0):
+        # drop every timer and restart the clock at now's tick (0 by default)
+        for wheel in self.wheels:
+            for bucket in wheel:
+                bucket.clear()
+        self.current = int(now / self.resolution + 1e-9)
+        self.pending = 0
+
+    def advance(self, now):
+        # fire everything due at or before `now`; returns the number fired
+        target = int(now / self.resolution + 1e-9)
+        fired = 0
+        wheels = self.wheels
+        bits = self.bits
+        mask = self.mask
+        while self.current < target:
+            if not self.pending:
+                # nothing scheduled: jump straight to the target
+                self.current = target
+                break
+            self.current += 1
+            t = self.current
+            if not (t & mask):
+                # cascade from the highest level that wrapped down to level 1
+                top = 1
+                while top < self.levels - 1 and not (t >> (bits * top)) & mask:
+                    top += 1
+                for level in range(top, 0, -1):
+                    idx = (t >> (bits * level)) & mask
+                    bucket = wheels[level][idx]
+                    if bucket:
+                        wheels[level][idx] = []
+                        for entry in bucket:
+                            self._insert(entry)
+            idx = t & mask
+            bucket = wheels[0][idx]
+            if not bucket:
+                continue
+            wheels[0][idx] = []
+            for entry in bucket:
+                if not entry[3]:
+                    continue
+                entry[3] = False
+                self.pending -= 1
+                fired += 1
+                # callbacks may schedule new timers, including for this tick
+                entry[1](entry[2])
+        return fired
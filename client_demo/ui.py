@@ -1,5 +1,55 @@
 import pygame
+from collections import OrderedDict
 from typing import List, Optional
+from display import mouse_pos
+
+
+SHADOW = 3
+_faces = OrderedDict()
+_backdrops = {}
+
+
+def render_button_face(size, text, font, fill, text_color=(240, 240, 240)):
+    # shadow, fill, border and label pre-composited on one transparent surface
+    w, h = size
+    surf = pygame.Surface((w + SHADOW, h + SHADOW), pygame.SRCALPHA)
+    rect = pygame.Rect(0, 0, w, h)
+    pygame.draw.rect(surf, (20, 20, 20), rect.move(SHADOW, SHADOW), border_radius=6)
+    pygame.draw.rect(surf, fill, rect, border_radius=6)
+    pygame.draw.rect(surf, (200, 200, 200), rect, 2, border_radius=6)
+    txt = font.render(text, True, text_color)
+    surf.blit(txt, txt.get_rect(center=rect.center))
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert_alpha()
+    return surf
+
+
+def button_face(size, text, font, fill, text_color=(240, 240, 240), limit=128):
+    # shared cache for immediate-mode buttons (BaseScene.draw_button)
+    key = (size[0], size[1], text, id(font), fill, text_color)
+    surf = _faces.get(key)
+    if surf is None:
+        surf = _faces[key] = render_button_face(size, text, font, fill, text_color)
+        if len(_faces) > limit:
+            _faces.popitem(last=False)
+    else:
+        _faces.move_to_end(key)
+    return surf
+
+
+def backdrop(size, alpha=160):
+    # one dimmed full-screen layer per screen size, shared by every modal;
+    # plain surface alpha blits much faster than a per-pixel alpha overlay
+    key = (size[0], size[1], alpha)
+    surf = _backdrops.get(key)
+    if surf is None:
+        surf = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        surf.fill((0, 0, 0))
+        surf.set_alpha(alpha)
+        _backdrops[key] = surf
+    return surf
 
 
 class Button:
@@ -8,17 +58,21 @@ class Button:
         self.text = text
         self.callback = callback
         self.font = font or pygame.font.SysFont(None, 24)
+        self._faces = None
+        self._faces_key = None
+
+    def faces(self):
+        # (normal, hover) surfaces, re-rasterized only when text or size change
+        key = (self.text, self.rect.size)
+        if key != self._faces_key:
+            self._faces = (render_button_face(self.rect.size, self.text, self.font, (80, 80, 80)),
+                           render_button_face(self.rect.size, self.text, self.font, (110, 110, 110)))
+            self._faces_key = key
+        return self._faces
 
     def render(self, surface, mouse_pos):
         hover = self.rect.collidepoint(mouse_pos)
-        color = (110, 110, 110) if hover else (80, 80, 80)
-        shadow = self.rect.move(3, 3)
-        pygame.draw.rect(surface, (20, 20, 20), shadow, border_radius=6)
-        pygame.draw.rect(surface, color, self.rect, border_radius=6)
-        pygame.draw.rect(surface, (200, 200, 200), self.rect, 2, border_radius=6)
-        txt = self.font.render(self.text, True, (240, 240, 240))
-        tr = txt.get_rect(center=self.rect.center)
-        surface.blit(txt, tr)
+        surface.blit(self.faces()[1 if hover else 0], self.rect.topleft)
 
     def handle_event(self, event, mouse_pos):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -33,6 +87,26 @@ class Modal:
     def __init__(self, surface_size):
         self.surface_size = surface_size
         self.result = None
+        self.rect = None
+        self._panel = None
+
+    def draw_panel(self, panel):
+        # static box contents, drawn once in panel-local coordinates
+        pass
+
+    def render_chrome(self, surface):
+        # dimmed backdrop plus the cached panel; only buttons and live text
+        # are drawn on top each frame
+        surface.blit(backdrop(self.surface_size), (0, 0))
+        if self.rect is None:
+            return
+        if self._panel is None:
+            panel = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            self.draw_panel(panel)
+            if pygame.display.get_surface() is not None:
+                panel = panel.convert_alpha()
+            self._panel = panel
+        surface.blit(self._panel, self.rect.topleft)
 
     def handle_event(self, event):
         pass
@@ -64,24 +138,22 @@ class ConfirmDialog(Modal):
         self.result = False
 
     def handle_event(self, event):
-        mouse = pygame.mouse.get_pos()
+        mouse = mouse_pos()
         if self.btn_yes.handle_event(event, mouse):
             return
         if self.btn_no.handle_event(event, mouse):
             return
 
+    def draw_panel(self, panel):
+        box = panel.get_rect()
+        pygame.draw.rect(panel, (40, 40, 40), box, border_radius=8)
+        pygame.draw.rect(panel, (200, 200, 200), box, 2, border_radius=8)
+        panel.blit(self.font.render(self.title, True, (255, 255, 255)), (16, 12))
+        panel.blit(self.font.render(self.message, True, (220, 220, 220)), (16, 46))
+
     def render(self, surface):
-        # darken background
-        overlay = pygame.Surface(self.surface_size).convert_alpha()
-        overlay.fill((0, 0, 0, 160))
-        surface.blit(overlay, (0, 0))
-        pygame.draw.rect(surface, (40, 40, 40), self.rect, border_radius=8)
-        pygame.draw.rect(surface, (200, 200, 200), self.rect, 2, border_radius=8)
-        title_s = self.font.render(self.title, True, (255, 255, 255))
-        surface.blit(title_s, (self.rect.x + 16, self.rect.y + 12))
-        msg_s = self.font.render(self.message, True, (220, 220, 220))
-        surface.blit(msg_s, (self.rect.x + 16, self.rect.y + 46))
-        mouse = pygame.mouse.get_pos()
+        self.render_chrome(surface)
+        mouse = mouse_pos()
         self.btn_yes.render(surface, mouse)
         self.btn_no.render(surface, mouse)
 
@@ -97,6 +169,8 @@ class PromptDialog(Modal):
         self.input_rect = pygame.Rect(self.rect.x + 20, self.rect.y + 64, self.rect.w - 40, 36)
         self.text = default_text
         self.active = True
+        self._text_surf = None
+        self._text_key = None
         self.btn_ok = Button(pygame.Rect(self.rect.x + 140, self.rect.y + 116, 100, 36), 'OK', callback=self._ok, font=self.font)
         self.btn_cancel = Button(pygame.Rect(self.rect.x + 280, self.rect.y + 116, 100, 36), 'Cancel', callback=self._cancel, font=self.font)
 
@@ -116,27 +190,29 @@ class PromptDialog(Modal):
                 if len(event.unicode) and len(self.text) < 64:
                     self.text += event.unicode
         elif event.type == pygame.MOUSEBUTTONDOWN:
-            mouse = pygame.mouse.get_pos()
+            mouse = mouse_pos()
             if self.btn_ok.handle_event(event, mouse) or self.btn_cancel.handle_event(event, mouse):
                 return
             # toggle active if clicked input
-            self.active = self.input_rect.collidepoint(pygame.mouse.get_pos())
+            self.active = self.input_rect.collidepoint(mouse_pos())
+
+    def draw_panel(self, panel):
+        box = panel.get_rect()
+        pygame.draw.rect(panel, (36, 36, 36), box, border_radius=6)
+        pygame.draw.rect(panel, (180, 180, 180), box, 2, border_radius=6)
+        panel.blit(self.font.render(self.title, True, (255, 255, 255)), (12, 8))
+        panel.blit(self.font.render(self.prompt, True, (220, 220, 220)), (12, 40))
+        # input box
+        pygame.draw.rect(panel, (255, 255, 255), self.input_rect.move(-self.rect.x, -self.rect.y), 2)
 
     def render(self, surface):
-        overlay = pygame.Surface(self.surface_size).convert_alpha()
-        overlay.fill((0, 0, 0, 160))
-        surface.blit(overlay, (0, 0))
-        pygame.draw.rect(surface, (36, 36, 36), self.rect, border_radius=6)
-        pygame.draw.rect(surface, (180, 180, 180), self.rect, 2, border_radius=6)
-        title_s = self.font.render(self.title, True, (255, 255, 255))
-        surface.blit(title_s, (self.rect.x + 12, self.rect.y + 8))
-        prompt_s = self.font.render(self.prompt, True, (220, 220, 220))
-        surface.blit(prompt_s, (self.rect.x + 12, self.rect.y + 40))
-        # input box
-        pygame.draw.rect(surface, (255, 255, 255), self.input_rect, 2)
-        txt = self.font.render(self.text, True, (240, 240, 240))
-        surface.blit(txt, (self.input_rect.x + 8, self.input_rect.y + 6))
-        mouse = pygame.mouse.get_pos()
+        self.render_chrome(surface)
+        # typed text is the only thing that changes; re-render it on edits
+        if self._text_key != self.text:
+            self._text_surf = self.font.render(self.text, True, (240, 240, 240))
+            self._text_key = self.text
+        surface.blit(self._text_surf, (self.input_rect.x + 8, self.input_rect.y + 6))
+        mouse = mouse_pos()
         self.btn_ok.render(surface, mouse)
         self.btn_cancel.render(surface, mouse)
 
@@ -160,19 +236,19 @@ class OptionDialog(Modal):
         self.result = opt
 
     def handle_event(self, event):
-        mouse = pygame.mouse.get_pos()
+        mouse = mouse_pos()
         for b in self.buttons:
             if b.handle_event(event, mouse):
                 return
 
+    def draw_panel(self, panel):
+        box = panel.get_rect()
+        pygame.draw.rect(panel, (40, 40, 40), box, border_radius=8)
+        pygame.draw.rect(panel, (200, 200, 200), box, 2, border_radius=8)
+        panel.blit(self.font.render(self.title, True, (255, 255, 255)), (12, 8))
+
     def render(self, surface):
-        overlay = pygame.Surface(self.surface_size).convert_alpha()
-        overlay.fill((0, 0, 0, 160))
-        surface.blit(overlay, (0, 0))
-        pygame.draw.rect(surface, (40, 40, 40), self.rect, border_radius=8)
-        pygame.draw.rect(surface, (200, 200, 200), self.rect, 2, border_radius=8)
-        title_s = self.font.render(self.title, True, (255, 255, 255))
-        surface.blit(title_s, (self.rect.x + 12, self.rect.y + 8))
-        mouse = pygame.mouse.get_pos()
+        self.render_chrome(surface)
+        mouse = mouse_pos()
         for b in self.buttons:
             b.render(surface, mouse)